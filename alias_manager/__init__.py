@@ -3,18 +3,12 @@ Python Script Alias Manager Package
 Creates and manages aliases for Python scripts that can be run from anywhere in PATH.
 """
 
-from .core import PythonAliasManager
-from .config import ConfigManager
-from .venv_detector import VenvDetector
-from .script_generator import ScriptGenerator
-from .dependency_manager import DependencyManager
-from .environment_setup import EnvironmentSetup
-from .utils import safe_print, safe_unicode
+import importlib
 
 __version__ = "1.0.0"
 __all__ = [
     "PythonAliasManager",
-    "ConfigManager", 
+    "ConfigManager",
     "VenvDetector",
     "ScriptGenerator",
     "DependencyManager",
@@ -22,3 +16,30 @@ __all__ = [
     "safe_print",
     "safe_unicode"
 ]
+
+# Map each public name to the submodule that provides it so imports can be
+# deferred until the name is actually used (PEP 562).
+_LAZY = {
+    "PythonAliasManager": "core",
+    "ConfigManager": "config",
+    "VenvDetector": "venv_detector",
+    "ScriptGenerator": "script_generator",
+    "DependencyManager": "dependency_manager",
+    "EnvironmentSetup": "environment_setup",
+    "safe_print": "utils",
+    "safe_unicode": "utils",
+}
+
+
+def __getattr__(name):
+    """Import the submodule providing `name` on first attribute access."""
+    if name in _LAZY:
+        module = importlib.import_module("." + _LAZY[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -3,112 +3,287 @@ Command-line interface for Python Alias Manager.
 Handles argument parsing and command routing.
 """
 
-import argparse
-from .core import PythonAliasManager
+import functools
+import sys
 
 
-def main():
-    """Main CLI entry point."""
-    parser = argparse.ArgumentParser(
-        description="Python Script Alias Manager",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  python_alias_manager.py add myapp ~/scripts/my_application.py
-  python_alias_manager.py add myapp ~/scripts/my_application.py --conda-env myenv
-  python_alias_manager.py list
-  python_alias_manager.py remove myapp
-  python_alias_manager.py remove myapp --keep-env
-  python_alias_manager.py remove myapp --remove-env
-  python_alias_manager.py run myapp --help
-  python_alias_manager.py venv myapp
-  python_alias_manager.py deps myapp
-  python_alias_manager.py deps myapp --install
-  python_alias_manager.py deps myapp --setup
-  python_alias_manager.py setup-deps myapp    # Auto-setup venv/conda + deps
-  python_alias_manager.py setup-deps myapp --force  # Force recreate environment
-  python_alias_manager.py setup
-        """
-    )
-    
-    subparsers = parser.add_subparsers(dest='command', help='Available commands')
-    
+@functools.lru_cache(maxsize=1)
+def _get_manager():
+    """Construct the PythonAliasManager once per process."""
+    from .core import PythonAliasManager
+    return PythonAliasManager()
+
+
+def _add_add(subparsers):
     # Add alias command with conda environment option
     add_parser = subparsers.add_parser('add', help='Add a new alias')
     add_parser.add_argument('alias_name', help='Name for the alias')
     add_parser.add_argument('script_path', help='Path to the Python script')
     add_parser.add_argument('--conda-env', help='Specify conda environment name to use')
-    
+
+
+def _add_remove(subparsers):
     # Remove alias command
     remove_parser = subparsers.add_parser('remove', help='Remove an alias')
     remove_parser.add_argument('alias_name', help='Name of the alias to remove')
     remove_parser.add_argument('--keep-env', action='store_true', help='Keep the virtual environment when removing the alias')
     remove_parser.add_argument('--remove-env', action='store_true', help='Automatically remove the virtual environment without prompting')
-    
+
+
+def _add_list(subparsers):
     # List aliases command
     subparsers.add_parser('list', help='List all aliases')
-    
+
+
+def _add_update(subparsers):
     # Update alias command
     update_parser = subparsers.add_parser('update', help='Update an existing alias')
     update_parser.add_argument('alias_name', help='Name of the alias to update')
     update_parser.add_argument('script_path', help='New path to the Python script')
     update_parser.add_argument('--conda-env', help='Specify conda environment name to use')
-    
+
+
+def _add_run(subparsers):
     # Run script command
     run_parser = subparsers.add_parser('run', help='Run a script by alias')
     run_parser.add_argument('alias_name', help='Name of the alias to run')
     run_parser.add_argument('args', nargs='*', help='Arguments to pass to the script')
-    
+
+
+def _add_setup(subparsers):
     # Setup command
     subparsers.add_parser('setup', help='Check and show PATH setup instructions')
-    
+
+
+def _add_venv(subparsers):
     # Virtual environment info command
     venv_parser = subparsers.add_parser('venv', help='Check virtual environment info for an alias')
     venv_parser.add_argument('alias_name', help='Name of the alias to check')
-    
+
+
+def _add_deps(subparsers):
     # Dependencies command
     deps_parser = subparsers.add_parser('deps', help='Check and manage dependencies for an alias')
     deps_parser.add_argument('alias_name', help='Name of the alias to check dependencies for')
     deps_parser.add_argument('--install', action='store_true', help='Install missing dependencies automatically')
     deps_parser.add_argument('--setup', action='store_true', help='Create virtual environment and install dependencies if needed')
-    
+
+
+def _add_setup_deps(subparsers):
     # Auto-setup command
     setup_deps_parser = subparsers.add_parser('setup-deps', help='Auto-create virtual environment or Anaconda environment and install dependencies for an alias')
     setup_deps_parser.add_argument('alias_name', help='Name of the alias to setup dependencies for')
     setup_deps_parser.add_argument('--force', action='store_true', help='Remove existing virtual environment and recreate it from scratch')
-    
-    args = parser.parse_args()
-    
-    if not args.command:
-        parser.print_help()
+
+
+_SUBPARSER_BUILDERS = {
+    'add': _add_add,
+    'remove': _add_remove,
+    'list': _add_list,
+    'update': _add_update,
+    'run': _add_run,
+    'setup': _add_setup,
+    'venv': _add_venv,
+    'deps': _add_deps,
+    'setup-deps': _add_setup_deps,
+}
+
+
+def _build_parser():
+    """Build the full argparse parser (help, usage and error reporting)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='python_alias_manager.py',
+        description="Python Script Alias Manager",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python_alias_manager.py add myapp ~/scripts/my_application.py
+  python_alias_manager.py add myapp ~/scripts/my_application.py --conda-env myenv
+  python_alias_manager.py list
+  python_alias_manager.py remove myapp
+  python_alias_manager.py remove myapp --keep-env
+  python_alias_manager.py remove myapp --remove-env
+  python_alias_manager.py run myapp --help
+  python_alias_manager.py venv myapp
+  python_alias_manager.py deps myapp
+  python_alias_manager.py deps myapp --install
+  python_alias_manager.py deps myapp --setup
+  python_alias_manager.py setup-deps myapp    # Auto-setup venv/conda + deps
+  python_alias_manager.py setup-deps myapp --force  # Force recreate environment
+  python_alias_manager.py setup
+        """
+    )
+
+    subparsers = parser.add_subparsers(dest='command', help='Available commands')
+    for builder in _SUBPARSER_BUILDERS.values():
+        builder(subparsers)
+
+    return parser
+
+
+def _split_args(argv, flag_spec):
+    """Split argv into positionals and recognized flags.
+
+    flag_spec maps each allowed flag to True when it takes a value.
+    Returns (positionals, flags) or None when an unknown flag appears or a
+    value is missing, signalling the caller to fall back to argparse.
+    """
+    positionals = []
+    flags = {}
+    i = 0
+    while i < len(argv):
+        token = argv[i]
+        if token.startswith('-'):
+            if token not in flag_spec:
+                return None
+            if flag_spec[token]:
+                if i + 1 >= len(argv):
+                    return None
+                flags[token] = argv[i + 1]
+                i += 2
+            else:
+                flags[token] = True
+                i += 1
+        else:
+            positionals.append(token)
+            i += 1
+    return positionals, flags
+
+
+def _parse_add(argv):
+    parsed = _split_args(argv, {'--conda-env': True})
+    if parsed is None or len(parsed[0]) != 2:
+        return None
+    positionals, flags = parsed
+    return {'alias_name': positionals[0], 'script_path': positionals[1],
+            'conda_env': flags.get('--conda-env')}
+
+
+def _parse_remove(argv):
+    parsed = _split_args(argv, {'--keep-env': False, '--remove-env': False})
+    if parsed is None or len(parsed[0]) != 1:
+        return None
+    positionals, flags = parsed
+    return {'alias_name': positionals[0],
+            'keep_env': '--keep-env' in flags,
+            'remove_env': '--remove-env' in flags}
+
+
+def _parse_list(argv):
+    if argv:
+        return None
+    return {}
+
+
+def _parse_update(argv):
+    parsed = _split_args(argv, {'--conda-env': True})
+    if parsed is None or len(parsed[0]) != 2:
+        return None
+    positionals, flags = parsed
+    return {'alias_name': positionals[0], 'script_path': positionals[1],
+            'conda_env': flags.get('--conda-env')}
+
+
+def _parse_run(argv):
+    # Everything after the alias name is passed through to the script
+    if not argv or argv[0].startswith('-'):
+        return None
+    return {'alias_name': argv[0], 'args': argv[1:]}
+
+
+def _parse_setup(argv):
+    if argv:
+        return None
+    return {}
+
+
+def _parse_venv(argv):
+    parsed = _split_args(argv, {})
+    if parsed is None or len(parsed[0]) != 1:
+        return None
+    return {'alias_name': parsed[0][0]}
+
+
+def _parse_deps(argv):
+    parsed = _split_args(argv, {'--install': False, '--setup': False})
+    if parsed is None or len(parsed[0]) != 1:
+        return None
+    positionals, flags = parsed
+    return {'alias_name': positionals[0],
+            'install': '--install' in flags,
+            'setup': '--setup' in flags}
+
+
+def _parse_setup_deps(argv):
+    parsed = _split_args(argv, {'--force': False})
+    if parsed is None or len(parsed[0]) != 1:
+        return None
+    positionals, flags = parsed
+    return {'alias_name': positionals[0], 'force': '--force' in flags}
+
+
+_COMMAND_PARSERS = {
+    'add': _parse_add,
+    'remove': _parse_remove,
+    'list': _parse_list,
+    'update': _parse_update,
+    'run': _parse_run,
+    'setup': _parse_setup,
+    'venv': _parse_venv,
+    'deps': _parse_deps,
+    'setup-deps': _parse_setup_deps,
+}
+
+
+def main():
+    """Main CLI entry point."""
+    argv = sys.argv[1:]
+    command = argv[0] if argv else None
+
+    if command is None or command in ('-h', '--help'):
+        _build_parser().print_help()
         return
-    
-    manager = PythonAliasManager()
-    
-    if args.command == 'add':
-        manager.add_alias(args.alias_name, args.script_path, args.conda_env)
+
+    # Fast path: hand-parse the fixed command grammar.  Anything the simple
+    # parser cannot handle (unknown command, bad arity, -h on a subcommand)
+    # falls back to argparse for its usage/error/help output.
+    parse = _COMMAND_PARSERS.get(command)
+    parsed = parse(argv[1:]) if parse else None
+    if parsed is None:
+        args = _build_parser().parse_args(argv)
+        command = args.command
+        parsed = vars(args)
+        parsed.pop('command', None)
+
+    # Constructed lazily so --help and the no-command path skip the heavy
+    # core imports; cached so repeated calls share one manager per process.
+    manager = _get_manager()
+
+    if command == 'add':
+        manager.add_alias(parsed['alias_name'], parsed['script_path'], parsed['conda_env'])
         manager.check_path_setup()
-    elif args.command == 'remove':
-        keep_env = getattr(args, 'keep_env', False)
-        remove_env = getattr(args, 'remove_env', False)
-        manager.remove_alias(args.alias_name, keep_env=keep_env, remove_env=remove_env)
-    elif args.command == 'list':
+    elif command == 'remove':
+        manager.remove_alias(parsed['alias_name'],
+                             keep_env=parsed.get('keep_env', False),
+                             remove_env=parsed.get('remove_env', False))
+    elif command == 'list':
         manager.list_aliases()
-    elif args.command == 'update':
-        conda_env = getattr(args, 'conda_env', None)
-        manager.update_alias(args.alias_name, args.script_path, conda_env)
-    elif args.command == 'run':
-        manager.run_script(args.alias_name, args.args)
-    elif args.command == 'setup':
+    elif command == 'update':
+        manager.update_alias(parsed['alias_name'], parsed['script_path'], parsed.get('conda_env'))
+    elif command == 'run':
+        manager.run_script(parsed['alias_name'], parsed['args'])
+    elif command == 'setup':
         manager.check_path_setup()
-    elif args.command == 'venv':
-        manager.check_venv_info(args.alias_name)
-    elif args.command == 'deps':
-        install_flag = args.install or args.setup
-        manager.check_dependencies(args.alias_name, install_flag)
-    elif args.command == 'setup-deps':
-        force_recreate = getattr(args, 'force', False)
-        manager.auto_setup_dependencies(args.alias_name, True, force_recreate=force_recreate)
+    elif command == 'venv':
+        manager.check_venv_info(parsed['alias_name'])
+    elif command == 'deps':
+        install_flag = parsed['install'] or parsed['setup']
+        manager.check_dependencies(parsed['alias_name'], install_flag)
+    elif command == 'setup-deps':
+        manager.auto_setup_dependencies(parsed['alias_name'], True,
+                                        force_recreate=parsed.get('force', False))
 
 
 if __name__ == "__main__":
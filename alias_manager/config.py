@@ -5,87 +5,189 @@ Handles loading and saving alias configurations.
 
 import json
 import os
+import time
 from pathlib import Path
 from typing import Dict
 
+from .utils import safe_print
 
-def safe_print(*args, **kwargs):
-    """Print with safe Unicode handling for Windows."""
+# aliases.json is a flat alias->path mapping, so a typed msgspec decoder can
+# skip generic object construction entirely.  Prefer msgspec, then orjson's C
+# parser/serializer, then stdlib json.  All paths read and write bytes so
+# file handles can stay in binary mode.
+try:
+    import msgspec
+
+    _loads = msgspec.json.Decoder(Dict[str, str]).decode
+    _encode = msgspec.json.Encoder().encode
+
+    def _dumps(data) -> bytes:
+        return msgspec.json.format(_encode(data), indent=2)
+except ImportError:
     try:
-        print(*args, **kwargs)
-    except UnicodeEncodeError:
-        # Replace Unicode characters with ASCII equivalents on Windows
-        safe_args = []
-        for arg in args:
-            if isinstance(arg, str):
-                arg = arg.replace('✓', '*').replace('⚠', '!').replace('❌', 'X').replace('🎉', '!')
-            safe_args.append(arg)
-        print(*safe_args, **kwargs)
+        import orjson
+
+        _loads = orjson.loads
+
+        def _dumps(data) -> bytes:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    except ImportError:
+        _loads = json.loads
+
+        def _dumps(data) -> bytes:
+            return json.dumps(data, indent=2).encode('utf-8')
+
+
+_config_singleton = None
+
+
+def get_config() -> "ConfigManager":
+    """Return the shared per-process ConfigManager instance."""
+    global _config_singleton
+    if _config_singleton is None:
+        _config_singleton = ConfigManager()
+    return _config_singleton
 
 
 class ConfigManager:
     """Manages configuration and alias storage for the Python Alias Manager."""
     
     def __init__(self):
-        # Create a directory for storing aliases and config
+        # Create a directory for storing aliases and config.  Stat first:
+        # on warm systems the directories already exist and a plain stat is
+        # cheaper than mkdir's EEXIST handling.
         self.alias_dir = Path.home() / ".python_aliases"
-        self.alias_dir.mkdir(exist_ok=True)
-        
+        try:
+            os.stat(self.alias_dir)
+        except FileNotFoundError:
+            self.alias_dir.mkdir(parents=True, exist_ok=True)
+
         # Config file to store alias mappings
         self.config_file = self.alias_dir / "aliases.json"
-        
+
+        # Persistent cache of venv detection results across CLI runs
+        self.venv_cache_file = self.alias_dir / "venv_cache.json"
+
         # Directory where batch files will be created
         self.batch_dir = self.alias_dir / "bin"
-        self.batch_dir.mkdir(exist_ok=True)
-    
+        try:
+            os.stat(self.batch_dir)
+        except FileNotFoundError:
+            self.batch_dir.mkdir(parents=True, exist_ok=True)
+
+        # Cache of the parsed config, keyed by the file's (mtime_ns, size),
+        # plus the raw bytes last seen on disk so no-op saves can be skipped
+        self._cache = None
+        self._cache_key = None
+        self._last_payload = None
+
     def load_aliases(self) -> Dict[str, str]:
         """Load existing aliases from config file."""
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return {}
-        return {}
-    
+        try:
+            st = self.config_file.stat()
+        except OSError:
+            return {}
+
+        key = (st.st_mtime_ns, st.st_size)
+        if key == self._cache_key:
+            return self._cache
+
+        try:
+            with open(self.config_file, 'rb') as f:
+                raw = f.read()
+            aliases = _loads(raw)
+        except (ValueError, IOError):
+            return {}
+
+        self._cache = aliases
+        self._cache_key = key
+        self._last_payload = raw
+        return aliases
+
     def save_aliases(self, aliases: Dict[str, str]):
         """Save aliases to config file."""
-        with open(self.config_file, 'w') as f:
-            json.dump(aliases, f, indent=2)
+        # Skip the write entirely when the serialized content matches what
+        # is already on disk (e.g. update_alias delegating to add_alias).
+        payload = _dumps(aliases)
+        if payload == self._last_payload:
+            return
+
+        # Write to a temp file and os.replace it so a crash mid-write can
+        # never leave a truncated aliases.json behind.
+        tmp_file = self.config_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            if os.name != 'nt':  # fsync is prohibitively slow on Windows
+                os.fsync(f.fileno())
+        os.replace(tmp_file, self.config_file)
+
+        # Keep the cache in sync with what was just written
+        try:
+            st = self.config_file.stat()
+            self._cache = aliases
+            self._cache_key = (st.st_mtime_ns, st.st_size)
+            self._last_payload = payload
+        except OSError:
+            self._cache = None
+            self._cache_key = None
+            self._last_payload = None
     
     def check_path_setup(self) -> bool:
         """Check if the alias directory is in PATH and provide setup instructions."""
+        # PATH setup rarely regresses once done; a stamp file younger than a
+        # day short-circuits both the PATH scan and the instruction dump.
+        stamp = self.alias_dir / ".path_ok"
+        try:
+            if time.time() - stamp.stat().st_mtime < 86400:
+                return True
+        except OSError:
+            pass
+
         path_env = os.environ.get('PATH', '')
         batch_dir_str = str(self.batch_dir)
-        
-        if batch_dir_str not in path_env:
-            safe_print(f"⚠️  Setup Required:")
-            safe_print(f"The alias directory is not in your PATH.")
-            safe_print(f"To use aliases from anywhere, add this directory to your PATH:")
-            safe_print(f"  {batch_dir_str}")
-            safe_print()
-            safe_print("Windows Setup Instructions:")
-            safe_print("1. Open System Properties (Win + Pause)")
-            safe_print("2. Click 'Advanced system settings'")
-            safe_print("3. Click 'Environment Variables'")
-            safe_print("4. Under 'User variables', find and select 'Path', then click 'Edit'")
-            safe_print("5. Click 'New' and add the path above")
-            safe_print("6. Click 'OK' to save")
-            safe_print("7. Restart your command prompt/PowerShell")
-            safe_print()
-            safe_print("PowerShell Command (as Administrator):")
-            safe_print(f'[Environment]::SetEnvironmentVariable("Path", $env:Path + ";{batch_dir_str}", [EnvironmentVariableTarget]::User)')
-            safe_print()
-            safe_print("Bash/Linux/macOS Setup Instructions:")
-            safe_print("Add this line to your ~/.bashrc, ~/.zshrc, or ~/.profile:")
-            safe_print(f'export PATH="$PATH:{batch_dir_str}"')
-            safe_print("Then run: source ~/.bashrc (or restart your terminal)")
-            safe_print()
-            safe_print("Git Bash on Windows:")
-            safe_print("Add this line to ~/.bashrc:")
-            safe_print(f'export PATH="$PATH:{batch_dir_str.replace(os.sep, "/")}"')
+
+        # Compare against actual PATH entries rather than substring matching,
+        # which could false-positive on partially overlapping paths.  Both
+        # sides are normalized so trailing separators and Windows case
+        # differences still count as a match.
+        path_entries = {os.path.normcase(os.path.normpath(entry))
+                        for entry in path_env.split(os.pathsep) if entry}
+
+        if os.path.normcase(os.path.normpath(batch_dir_str)) not in path_entries:
+            # Build the full instructions once and emit them in a single write
+            # instead of ~25 separate print calls.
+            safe_print('\n'.join([
+                f"⚠️  Setup Required:",
+                f"The alias directory is not in your PATH.",
+                f"To use aliases from anywhere, add this directory to your PATH:",
+                f"  {batch_dir_str}",
+                "",
+                "Windows Setup Instructions:",
+                "1. Open System Properties (Win + Pause)",
+                "2. Click 'Advanced system settings'",
+                "3. Click 'Environment Variables'",
+                "4. Under 'User variables', find and select 'Path', then click 'Edit'",
+                "5. Click 'New' and add the path above",
+                "6. Click 'OK' to save",
+                "7. Restart your command prompt/PowerShell",
+                "",
+                "PowerShell Command (as Administrator):",
+                f'[Environment]::SetEnvironmentVariable("Path", $env:Path + ";{batch_dir_str}", [EnvironmentVariableTarget]::User)',
+                "",
+                "Bash/Linux/macOS Setup Instructions:",
+                "Add this line to your ~/.bashrc, ~/.zshrc, or ~/.profile:",
+                f'export PATH="$PATH:{batch_dir_str}"',
+                "Then run: source ~/.bashrc (or restart your terminal)",
+                "",
+                "Git Bash on Windows:",
+                "Add this line to ~/.bashrc:",
+                f'export PATH="$PATH:{batch_dir_str.replace(os.sep, "/")}"',
+            ]))
+            stamp.unlink(missing_ok=True)
             return False
         else:
-            safe_print(f"✓ Alias directory is in PATH: {batch_dir_str}")
-            safe_print("Aliases will work in both Windows Command Prompt/PowerShell and Bash!")
+            safe_print(f"✓ Alias directory is in PATH: {batch_dir_str}\n"
+                       "Aliases will work in both Windows Command Prompt/PowerShell and Bash!")
+            stamp.touch()
             return True
@@ -3,52 +3,206 @@ Core Python Alias Manager class.
 Main orchestrator that coordinates all other modules.
 """
 
+import atexit
+import json
 import os
 import sys
 import subprocess
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, Optional
 
-from .config import ConfigManager
-from .venv_detector import VenvDetector
-from .script_generator import ScriptGenerator
-from .dependency_manager import DependencyManager
-from .environment_setup import EnvironmentSetup
+from .utils import safe_print
 
+# One-shot probe reporting interpreter version and installed-package count,
+# so environment inspection costs a single subprocess instead of two.
+_ENV_PROBE = (
+    "import sys, json; from importlib.metadata import distributions; "
+    "print(json.dumps({'v': sys.version.split()[0], "
+    "'n': sum(1 for _ in distributions())}))"
+)
 
-def safe_print(*args, **kwargs):
-    """Print with safe Unicode handling for Windows."""
-    try:
-        print(*args, **kwargs)
-    except UnicodeEncodeError:
-        # Replace Unicode characters with ASCII equivalents on Windows
-        safe_args = []
-        for arg in args:
-            if isinstance(arg, str):
-                arg = arg.replace('✓', '*').replace('⚠', '!').replace('❌', 'X').replace('🎉', '!')
-            safe_args.append(arg)
-        print(*safe_args, **kwargs)
+
+def _run(cmd, timeout=30):
+    """Run a command with captured output, a closed stdin and explicit UTF-8.
+
+    Pinning the encoding avoids locale codec lookups (and mojibake on
+    Windows CP1252); DEVNULL stops children from blocking on our stdin.
+    """
+    return subprocess.run(cmd, capture_output=True, stdin=subprocess.DEVNULL,
+                          encoding='utf-8', errors='replace', timeout=timeout)
 
 
 class PythonAliasManager:
     """Main class for managing Python script aliases."""
-    
+
     def __init__(self):
-        # Initialize all components
-        self.config_manager = ConfigManager()
-        self.venv_detector = VenvDetector()
-        self.script_generator = ScriptGenerator(self.config_manager.batch_dir)
-        self.dependency_manager = DependencyManager()
-        self.environment_setup = EnvironmentSetup()
-        
-        # Load existing aliases
-        self.aliases = self.config_manager.load_aliases()
-    
+        # Components and the alias map are cached_property definitions below,
+        # so short commands only import and build what they actually touch.
+
+        # Per-process cache of detect_venv results keyed by script path
+        self._venv_cache: Dict[str, Optional[Dict[str, str]]] = {}
+
+        # Per-process cache of installed packages keyed by interpreter path,
+        # so multi-alias operations spawn one pip per unique interpreter
+        self._installed_pkgs_cache: Dict[str, set] = {}
+
+        # Per-process cache of site-packages mtimes keyed by interpreter path
+        self._sp_mtime_cache: Dict[str, Optional[int]] = {}
+
+        # The persistent venv cache is flushed at most once, at exit
+        self._venv_disk_dirty = False
+        atexit.register(self._flush_venv_cache)
+
+    @cached_property
+    def config_manager(self):
+        from .config import get_config
+        return get_config()
+
+    @cached_property
+    def venv_detector(self):
+        from .venv_detector import get_detector
+        return get_detector()
+
+    @cached_property
+    def script_generator(self):
+        from .script_generator import ScriptGenerator
+        return ScriptGenerator(self.config_manager.batch_dir)
+
+    @cached_property
+    def dependency_manager(self):
+        from .dependency_manager import DependencyManager
+        return DependencyManager()
+
+    @cached_property
+    def environment_setup(self):
+        from .environment_setup import EnvironmentSetup
+        return EnvironmentSetup()
+
+    @cached_property
+    def aliases(self) -> Dict[str, str]:
+        return self.config_manager.load_aliases()
+
+    def _installed_packages(self, python_exe: str) -> set:
+        """Get installed packages for an interpreter, caching per process."""
+        if python_exe not in self._installed_pkgs_cache:
+            self._installed_pkgs_cache[python_exe] = \
+                self.dependency_manager.get_installed_packages(python_exe)
+        return self._installed_pkgs_cache[python_exe]
+
+    def _site_packages_mtime(self, python_exe: str) -> Optional[int]:
+        """Newest mtime among the interpreter's site-packages dirs, or None."""
+        if python_exe in self._sp_mtime_cache:
+            return self._sp_mtime_cache[python_exe]
+
+        mtime = None
+        try:
+            if os.path.realpath(python_exe) == os.path.realpath(sys.executable):
+                import site
+                paths = site.getsitepackages()
+            else:
+                result = _run([python_exe, '-c',
+                               'import site, json; print(json.dumps(site.getsitepackages()))'],
+                              timeout=15)
+                paths = json.loads(result.stdout) if result.returncode == 0 else []
+            mtimes = [os.stat(p).st_mtime_ns for p in paths if os.path.exists(p)]
+            if mtimes:
+                mtime = max(mtimes)
+        except Exception:
+            mtime = None
+
+        self._sp_mtime_cache[python_exe] = mtime
+        return mtime
+
+    def _deps_check_state(self, alias_name: str, requirements_file: str,
+                          python_exe: str) -> Optional[list]:
+        """Build the cache entry describing the current deps-relevant state."""
+        sp_mtime = self._site_packages_mtime(python_exe)
+        if sp_mtime is None:
+            return None
+        try:
+            req_mtime = os.stat(requirements_file).st_mtime_ns
+        except OSError:
+            return None
+        return [requirements_file, req_mtime, python_exe, sp_mtime]
+
+    @property
+    def _deps_cache_file(self) -> Path:
+        return self.config_manager.batch_dir / ".deps_cache.json"
+
+    def _load_deps_cache(self) -> Dict[str, list]:
+        try:
+            return json.loads(self._deps_cache_file.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _store_deps_state(self, alias_name: str, deps_state: list):
+        cache = self._load_deps_cache()
+        cache[alias_name] = deps_state
+        try:
+            self._deps_cache_file.write_text(json.dumps(cache, indent=2))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _venv_cache_key(script_path: str) -> list:
+        """Mtimes of the script dir and the parents detect_venv walks."""
+        script_dir = Path(script_path).parent
+        mtimes = []
+        for directory in [script_dir, *list(script_dir.parents)[:3]]:
+            try:
+                mtimes.append(os.stat(directory).st_mtime_ns)
+            except OSError:
+                mtimes.append(0)
+        return mtimes
+
+    @cached_property
+    def _venv_disk_cache(self) -> dict:
+        try:
+            return json.loads(self.config_manager.venv_cache_file.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _flush_venv_cache(self):
+        if self._venv_disk_dirty:
+            try:
+                self.config_manager.venv_cache_file.write_text(
+                    json.dumps(self._venv_disk_cache))
+                self._venv_disk_dirty = False
+            except OSError:
+                pass
+
+    def _detect_venv_cached(self, script_path: str) -> Optional[Dict[str, str]]:
+        """Detect the venv for a script, serving repeats from cache.
+
+        Results are kept per process and persisted to venv_cache.json keyed
+        by the mtimes of the directories the detector walks, so unchanged
+        trees skip the probing entirely on later CLI runs.
+        """
+        if script_path in self._venv_cache:
+            return self._venv_cache[script_path]
+
+        key = self._venv_cache_key(script_path)
+        entry = self._venv_disk_cache.get(script_path)
+        if entry and entry[0] == key:
+            venv_info = entry[1]
+        else:
+            venv_info = self.venv_detector.detect_venv(script_path)
+            self._venv_disk_cache[script_path] = [key, venv_info]
+            self._venv_disk_dirty = True
+
+        self._venv_cache[script_path] = venv_info
+        return venv_info
+
+
     def add_alias(self, alias_name: str, script_path: str, conda_env: Optional[str] = None) -> bool:
         """Add a new alias for a Python script."""
         # Resolve the script path to absolute path
         script_path = os.path.abspath(script_path)
-        
+        self._venv_cache.pop(script_path, None)
+        if self._venv_disk_cache.pop(script_path, None) is not None:
+            self._venv_disk_dirty = True
+
         # Check if script exists
         if not os.path.exists(script_path):
             print(f"Error: Script '{script_path}' does not exist.")
@@ -125,23 +279,31 @@ class PythonAliasManager:
             return False
         
         script_path = self.aliases[alias_name]
-        
+        self._venv_cache.pop(script_path, None)
+        if self._venv_disk_cache.pop(script_path, None) is not None:
+            self._venv_disk_dirty = True
+
         # Check for virtual environment before removing alias
         venv_info = None
         if os.path.exists(script_path):
             venv_info = self.venv_detector.detect_venv(script_path)
         
-        # Remove both batch file and shell script
+        # Remove both batch file and shell script; unlink(missing_ok=True)
+        # avoids the stat-then-unlink race and halves the syscalls
         batch_file = self.config_manager.batch_dir / f"{alias_name}.bat"
         shell_file = self.config_manager.batch_dir / alias_name
-        
-        if batch_file.exists():
-            batch_file.unlink()
+
+        try:
+            batch_file.unlink(missing_ok=True)
             print(f"Removed Windows batch file: {batch_file}")
-        
-        if shell_file.exists():
-            shell_file.unlink()
+        except OSError:
+            pass
+
+        try:
+            shell_file.unlink(missing_ok=True)
             print(f"Removed bash shell script: {shell_file}")
+        except OSError:
+            pass
         
         # Remove from config
         del self.aliases[alias_name]
@@ -193,13 +355,33 @@ class PythonAliasManager:
             print("No aliases found.")
             return
         
-        print("Current aliases:")
-        print("-" * 80)
+        # Accumulate output and emit it as a single write at the end instead
+        # of taking the stdout lock (and a console syscall) per line
+        out = []
+        out.append("Current aliases:")
+        out.append("-" * 80)
+
+        # Stat each script once up front instead of per-use inside the loop
+        exists_map = {script: os.path.isfile(script) for script in self.aliases.values()}
+
+        # Detect venvs for all existing scripts concurrently; the walks are
+        # pure I/O with no shared state, so threads overlap the syscalls.
+        venv_infos = {script: None for script in self.aliases.values()}
+        to_probe = [script for script, exists in exists_map.items()
+                    if exists and script not in self._venv_cache]
+        if to_probe:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(32, len(to_probe))) as executor:
+                # _detect_venv_cached consults/fills the persistent cache too
+                for _ in executor.map(self._detect_venv_cached, to_probe):
+                    pass
+
         for alias, script in self.aliases.items():
-            status = "*" if os.path.exists(script) else "X"
-            
-            # Get virtual environment info
-            venv_info = self.venv_detector.detect_venv(script) if os.path.exists(script) else None
+            status = "*" if exists_map[script] else "X"
+
+            # Per-script result comes from the cache filled above
+            venv_info = self._detect_venv_cached(script) if exists_map[script] else None
+            venv_infos[script] = venv_info
             venv_status = ""
             
             if venv_info:
@@ -210,31 +392,33 @@ class PythonAliasManager:
                 elif venv_info.get('type') == 'project':
                     venv_status = " 📦 [project]"
             
-            print(f"{status} {alias:<20} -> {script}{venv_status}")
-            
+            out.append(f"{status} {alias:<20} -> {script}{venv_status}")
+
             # Show detailed venv info if available
             if venv_info and venv_info.get('type') == 'venv':
-                print(f"   {'':>21}    Virtual env: {venv_info['path']}")
+                out.append(f"   {'':>21}    Virtual env: {venv_info['path']}")
                 if venv_info.get('parent_level'):
-                    print(f"   {'':>21}    Location: {venv_info['parent_level']} level(s) up")
+                    out.append(f"   {'':>21}    Location: {venv_info['parent_level']} level(s) up")
             elif venv_info and venv_info.get('type') == 'conda':
-                print(f"   {'':>21}    Conda env: {venv_info['conda_env_file']}")
+                out.append(f"   {'':>21}    Conda env: {venv_info['conda_env_file']}")
                 conda_env_name = venv_info.get('conda_env_name')
                 if conda_env_name:
-                    print(f"   {'':>21}    Environment: {conda_env_name}")
+                    out.append(f"   {'':>21}    Environment: {conda_env_name}")
                 else:
-                    print(f"   {'':>21}    Warning: Environment name not found")
+                    out.append(f"   {'':>21}    Warning: Environment name not found")
             elif venv_info and venv_info.get('type') == 'project':
-                print(f"   {'':>21}    Dependencies: {venv_info['requirements_file']}")
-        
-        # Show summary
+                out.append(f"   {'':>21}    Dependencies: {venv_info['requirements_file']}")
+
+        # Show summary.  Count per alias, not per unique script — several
+        # aliases can share one (cached) detection result.
         total_aliases = len(self.aliases)
-        venv_aliases = sum(1 for script in self.aliases.values() 
-                          if os.path.exists(script) and self.venv_detector.detect_venv(script))
-        print("-" * 80)
-        print(f"Total aliases: {total_aliases}")
-        print(f"With virtual environments: {venv_aliases}")
-        print(f"Without virtual environments: {total_aliases - venv_aliases}")
+        venv_aliases = sum(1 for script in self.aliases.values() if venv_infos[script])
+        out.append("-" * 80)
+        out.append(f"Total aliases: {total_aliases}")
+        out.append(f"With virtual environments: {venv_aliases}")
+        out.append(f"Without virtual environments: {total_aliases - venv_aliases}")
+
+        sys.stdout.write('\n'.join(out) + '\n')
     
     def update_alias(self, alias_name: str, new_script_path: str, conda_env: str = None) -> bool:
         """Update an existing alias."""
@@ -255,21 +439,22 @@ class PythonAliasManager:
             return False
         
         script_path = self.aliases[alias_name]
+        script_path_obj = Path(script_path)
         if not os.path.exists(script_path):
             print(f"Script '{script_path}' no longer exists.")
             return False
-        
+
         print(f"Virtual Environment Information for '{alias_name}':")
         print(f"Script: {script_path}")
         print("-" * 60)
-        
-        venv_info = self.venv_detector.detect_venv(script_path)
+
+        venv_info = self._detect_venv_cached(script_path)
         
         if not venv_info:
             print("❌ No virtual environment detected")
             print("\nRecommendations:")
             print("• Create a virtual environment for this project:")
-            print(f"  cd {Path(script_path).parent}")
+            print(f"  cd {script_path_obj.parent}")
             print("  python -m venv venv")
             print("  venv\\Scripts\\activate  # Windows")
             print("  source venv/bin/activate  # Linux/macOS")
@@ -290,27 +475,20 @@ class PythonAliasManager:
             if venv_python:
                 print(f"Python executable: {venv_python}")
                 
-                # Try to get Python version from venv
-                try:
-                    result = subprocess.run([venv_python, "--version"], 
-                                         capture_output=True, text=True)
-                    if result.returncode == 0:
-                        print(f"Python version: {result.stdout.strip()}")
-                except Exception:
-                    print("Python version: Unable to determine")
-                
-                # Try to list installed packages
+                # Probe version and package count in a single subprocess
                 try:
-                    result = subprocess.run([venv_python, "-m", "pip", "list"], 
-                                         capture_output=True, text=True)
+                    result = _run([venv_python, "-c", _ENV_PROBE], timeout=15)
                     if result.returncode == 0:
-                        lines = result.stdout.strip().split('\n')
-                        if len(lines) > 2:
-                            print(f"Installed packages: {len(lines) - 2} packages")
+                        probe = json.loads(result.stdout)
+                        print(f"Python version: Python {probe['v']}")
+                        if probe['n']:
+                            print(f"Installed packages: {probe['n']} packages")
                         else:
                             print("Installed packages: None")
+                    else:
+                        print("Python version: Unable to determine")
                 except Exception:
-                    print("Installed packages: Unable to determine")
+                    print("Python version: Unable to determine")
             
         elif venv_info.get('type') == 'conda':
             print(f"Conda environment file: {venv_info['conda_env_file']}")
@@ -320,29 +498,22 @@ class PythonAliasManager:
                 
                 if self.venv_detector.check_conda_available():
                     print("✅ Conda is available")
-                    
-                    # Try to get Python version from conda env
-                    try:
-                        result = subprocess.run(['conda', 'run', '-n', conda_env_name, 'python', '--version'], 
-                                             capture_output=True, text=True, timeout=30)
-                        if result.returncode == 0:
-                            print(f"Python version: {result.stdout.strip()}")
-                    except Exception:
-                        print("Python version: Unable to determine")
-                    
-                    # Try to list installed packages
+
+                    # Probe version and package count in a single conda run
                     try:
-                        result = subprocess.run(['conda', 'list', '-n', conda_env_name], 
-                                             capture_output=True, text=True, timeout=30)
+                        result = _run(['conda', 'run', '-n', conda_env_name,
+                                       'python', '-c', _ENV_PROBE])
                         if result.returncode == 0:
-                            lines = result.stdout.strip().split('\n')
-                            package_lines = [line for line in lines if not line.startswith('#') and line.strip()]
-                            if package_lines:
-                                print(f"Installed packages: {len(package_lines)} packages")
+                            probe = json.loads(result.stdout)
+                            print(f"Python version: Python {probe['v']}")
+                            if probe['n']:
+                                print(f"Installed packages: {probe['n']} packages")
                             else:
                                 print("Installed packages: None")
+                        else:
+                            print("Python version: Unable to determine")
                     except Exception:
-                        print("Installed packages: Unable to determine")
+                        print("Python version: Unable to determine")
                 else:
                     print("❌ Conda is not available in PATH")
                     print("Note: Install Anaconda/Miniconda or ensure conda is in your PATH")
@@ -371,7 +542,18 @@ class PythonAliasManager:
         cmd = [sys.executable, script_path]
         if args:
             cmd.extend(args)
-        
+
+        if os.name != 'nt':
+            # Nothing happens after the script finishes, so on POSIX replace
+            # this process outright instead of forking a child and waiting.
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os.execv(sys.executable, cmd)
+            except OSError as e:
+                print(f"Error running script: {e}")
+                return False
+
         try:
             subprocess.run(cmd)
             return True
@@ -386,17 +568,18 @@ class PythonAliasManager:
             return False
         
         script_path = self.aliases[alias_name]
+        script_path_obj = Path(script_path)
         if not os.path.exists(script_path):
             print(f"Script '{script_path}' no longer exists.")
             return False
-        
+
         print(f"Dependency Check for '{alias_name}':")
         print(f"Script: {script_path}")
         print("-" * 60)
-        
+
         # Detect virtual environment and requirements
         venv_info = self.venv_detector.detect_venv(script_path)
-        script_dir = Path(script_path).parent
+        script_dir = script_path_obj.parent
         
         # Check for requirements files
         requirements_file = self.dependency_manager.find_requirements_file(script_dir)
@@ -490,22 +673,34 @@ class PythonAliasManager:
                 print(f"⚠️  Conda environment detected but Python executable not found, using: {python_exe}")
         else:
             print(f"🐍 Using system Python: {python_exe}")
-        
-        # Get installed packages
+
+        # Short-circuit repeated checks: when neither the requirements file
+        # nor the interpreter's site-packages changed since the last clean
+        # check, skip pip enumeration entirely.
+        deps_state = self._deps_check_state(alias_name, requirements_file, python_exe)
+        if deps_state is not None and not install_missing:
+            cache = self._load_deps_cache()
+            if cache.get(alias_name) == deps_state:
+                print("\n🎉 All dependencies are installed! (unchanged since last check)")
+                return True
+
+        # Get installed packages (cached per interpreter for this process)
         print("\n🔍 Checking installed packages...")
-        installed_packages = self.dependency_manager.get_installed_packages(python_exe)
+        installed_packages = self._installed_packages(python_exe)
         
         if not installed_packages:
             print("❌ Could not retrieve installed packages list")
             return False
         
-        # Check each required package
+        # Check each required package against the pre-normalized frozenset;
+        # canonical names also keep '_' vs '-' spellings from reporting as missing
+        from .dependency_manager import canonical_name
+
         missing_packages = []
         installed_required = []
-        
+
         for package in required_packages:
-            package_lower = package.lower()
-            if package_lower in installed_packages:
+            if canonical_name(package) in installed_packages:
                 installed_required.append(package)
             else:
                 missing_packages.append(package)
@@ -548,6 +743,8 @@ class PythonAliasManager:
                 return False
         else:
             print(f"\n🎉 All dependencies are installed!")
+            if deps_state is not None:
+                self._store_deps_state(alias_name, deps_state)
             return True
 
     def auto_setup_dependencies(self, alias_name: str, install_missing: bool = True, force_recreate: bool = False) -> bool:
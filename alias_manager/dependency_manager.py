@@ -3,20 +3,54 @@ Dependency management for Python Alias Manager.
 Handles parsing requirements files, checking installed packages, and installing dependencies.
 """
 
+import functools
+import importlib.metadata
+import os
 import re
 import subprocess
+import sys
+import tomllib
 from pathlib import Path
 from typing import List, Set, Optional
 
+# PyYAML is optional; the libyaml-backed CSafeLoader parses environment.yml
+# files far faster than line scanning and handles nested pip sections
+# correctly.  Fall back to the line scanner when yaml is not installed.
+try:
+    import yaml
+    _YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+except ImportError:
+    yaml = None
+
+
+# PEP 503: runs of '-', '_' and '.' are equivalent in package names
+_NORMALIZE_RE = re.compile(r"[-_.]+")
+
+# Requirement-line pattern, compiled once instead of per line parsed
+_PKG_NAME_RE = re.compile(r'^([a-zA-Z0-9][a-zA-Z0-9._-]*[a-zA-Z0-9]|[a-zA-Z0-9])')
+
+
+def canonical_name(name: str) -> str:
+    """Normalize a package name to its PEP 503 canonical form."""
+    return _NORMALIZE_RE.sub("-", name).lower()
+
 
 class DependencyManager:
     """Manages dependencies for Python script aliases."""
-    
+
+    def __init__(self):
+        # Installed-package sets keyed by (python_executable, site-packages
+        # mtime) so repeat queries skip the pip subprocess, plus the resolved
+        # site-packages directory per interpreter.
+        self._installed_cache = {}
+        self._site_packages_cache = {}
+
     def parse_requirements_txt(self, requirements_file: str) -> List[str]:
         """Parse requirements.txt file and return list of package names."""
         packages = []
         try:
-            with open(requirements_file, 'r', encoding='utf-8') as f:
+            # 64 KB buffer: typical requirements files read in one syscall
+            with open(requirements_file, 'r', encoding='utf-8', buffering=65536) as f:
                 for line in f:
                     line = line.strip()
                     # Skip empty lines and comments
@@ -26,10 +60,9 @@ class DependencyManager:
                     # Handle different requirement formats
                     # package==1.2.3, package>=1.0, package~=1.0, etc.
                     # Extract just the package name
-                    match = re.match(r'^([a-zA-Z0-9][a-zA-Z0-9._-]*[a-zA-Z0-9]|[a-zA-Z0-9])', line)
+                    match = _PKG_NAME_RE.match(line)
                     if match:
-                        package_name = match.group(1)
-                        packages.append(package_name)
+                        packages.append(canonical_name(match.group(1)))
         except Exception as e:
             print(f"Error reading requirements file: {e}")
         
@@ -39,126 +72,201 @@ class DependencyManager:
         """Parse pyproject.toml file and return list of package names."""
         packages = []
         try:
-            # Basic TOML parsing for dependencies section
-            with open(pyproject_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # Look for [tool.poetry.dependencies] or [project] dependencies
-            in_dependencies = False
-            in_project_dependencies = False
-            
-            for line in content.split('\n'):
-                line = line.strip()
-                
-                # Check for poetry dependencies section
-                if line == '[tool.poetry.dependencies]':
-                    in_dependencies = True
-                    continue
-                elif line.startswith('[') and in_dependencies:
-                    in_dependencies = False
-                    continue
-                
-                # Check for PEP 621 project dependencies
-                if 'dependencies = [' in line:
-                    in_project_dependencies = True
-                    # Handle single-line dependencies
-                    deps_match = re.search(r'dependencies\s*=\s*\[(.*?)\]', line)
-                    if deps_match:
-                        deps_str = deps_match.group(1)
-                        for dep in re.findall(r'"([^"]+)"', deps_str):
-                            match = re.match(r'^([a-zA-Z0-9][a-zA-Z0-9._-]*[a-zA-Z0-9]|[a-zA-Z0-9])', dep)
-                            if match:
-                                packages.append(match.group(1))
-                        in_project_dependencies = False
-                    continue
-                elif line == ']' and in_project_dependencies:
-                    in_project_dependencies = False
-                    continue
-                
-                # Parse individual dependency lines
-                if in_dependencies and '=' in line and not line.startswith('#'):
-                    # Poetry format: package = "^1.0.0" or package = {version = "^1.0.0"}
-                    match = re.match(r'^([a-zA-Z0-9][a-zA-Z0-9._-]*[a-zA-Z0-9]|[a-zA-Z0-9])\s*=', line)
-                    if match and match.group(1) != 'python':  # Skip python version requirement
-                        packages.append(match.group(1))
-                elif in_project_dependencies and '"' in line:
-                    # PEP 621 format: "package>=1.0.0",
-                    dep_match = re.search(r'"([^"]+)"', line)
-                    if dep_match:
-                        dep = dep_match.group(1)
-                        match = re.match(r'^([a-zA-Z0-9][a-zA-Z0-9._-]*[a-zA-Z0-9]|[a-zA-Z0-9])', dep)
-                        if match:
-                            packages.append(match.group(1))
-                            
+            # tomllib's C-backed parser handles multi-line arrays, inline
+            # tables and Poetry's {version = "..."} form correctly, unlike
+            # the line-by-line regex scanning this used to do.
+            with open(pyproject_file, 'rb') as f:
+                data = tomllib.load(f)
+
+            # PEP 621: [project] dependencies is a list of PEP 508 strings.
+            # One C-level extend instead of a per-item append loop.
+            packages.extend(
+                canonical_name(m.group(1))
+                for m in (_PKG_NAME_RE.match(dep)
+                          for dep in data.get('project', {}).get('dependencies', []))
+                if m)
+
+            # Poetry: [tool.poetry.dependencies] maps name -> constraint
+            # ('python' is the interpreter requirement, not a package)
+            poetry_deps = data.get('tool', {}).get('poetry', {}).get('dependencies', {})
+            packages.extend(canonical_name(name) for name in poetry_deps if name != 'python')
+
         except Exception as e:
             print(f"Error reading pyproject.toml file: {e}")
-        
+
         return packages
 
     def parse_conda_env_dependencies(self, conda_env_file: str) -> List[str]:
         """Parse dependencies from a conda environment.yml file."""
+        if yaml is not None:
+            packages = []
+            try:
+                with open(conda_env_file, 'r', encoding='utf-8', buffering=65536) as f:
+                    data = yaml.load(f, Loader=_YAML_LOADER)
+
+                for entry in (data or {}).get('dependencies', []):
+                    if isinstance(entry, str):
+                        # Regular conda package, e.g. numpy=1.26
+                        match = _PKG_NAME_RE.match(entry)
+                        if match and match.group(1) != 'python':
+                            packages.append(canonical_name(match.group(1)))
+                    elif isinstance(entry, dict):
+                        # pip packages nested as {"pip": [...]}
+                        packages.extend(
+                            canonical_name(m.group(1))
+                            for m in (_PKG_NAME_RE.match(dep) for dep in entry.get('pip', []))
+                            if m)
+
+            except Exception as e:
+                print(f"Error parsing conda environment file: {e}")
+
+            return packages
+
+        return self._parse_conda_env_fallback(conda_env_file)
+
+    def _parse_conda_env_fallback(self, conda_env_file: str) -> List[str]:
+        """Line-scanning fallback used when PyYAML is not available."""
         packages = []
         try:
-            with open(conda_env_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
             in_dependencies = False
             in_pip_section = False
-            
-            for line in content.split('\n'):
-                line = line.strip()
-                
-                # Check for dependencies section
-                if line.startswith('dependencies:'):
-                    in_dependencies = True
-                    continue
-                elif line and not line.startswith(' ') and not line.startswith('-') and in_dependencies:
-                    in_dependencies = False
-                    in_pip_section = False
-                
-                if in_dependencies and line.startswith('- '):
-                    dep = line[2:].strip()
-                    if dep == 'pip:':
-                        in_pip_section = True
+
+            # Stream lines off a 64 KB buffer rather than materializing the
+            # whole file plus a second copy from split('\n')
+            with open(conda_env_file, 'r', encoding='utf-8', buffering=65536) as f:
+                for line in f:
+                    line = line.strip()
+
+                    # Check for dependencies section
+                    if line.startswith('dependencies:'):
+                        in_dependencies = True
                         continue
-                    elif not in_pip_section:
-                        # Regular conda package
-                        match = re.match(r'^([a-zA-Z0-9][a-zA-Z0-9._-]*[a-zA-Z0-9]|[a-zA-Z0-9])', dep)
-                        if match and match.group(1) != 'python':
-                            packages.append(match.group(1))
-                elif in_dependencies and in_pip_section and line.startswith('  - '):
-                    # pip package under dependencies
-                    dep = line[4:].strip()
-                    match = re.match(r'^([a-zA-Z0-9][a-zA-Z0-9._-]*[a-zA-Z0-9]|[a-zA-Z0-9])', dep)
-                    if match:
-                        packages.append(match.group(1))
-                        
+                    elif line and not line.startswith(' ') and not line.startswith('-') and in_dependencies:
+                        in_dependencies = False
+                        in_pip_section = False
+
+                    if not in_dependencies:
+                        continue
+
+                    # Classify the line with one C-level startswith(tuple)
+                    # probe instead of a chain of per-prefix method calls
+                    prefix = next((p for p in ('  - ', '- ') if line.startswith(p)), None)
+                    if prefix == '- ':
+                        dep = line[2:].strip()
+                        if dep == 'pip:':
+                            in_pip_section = True
+                            continue
+                        elif not in_pip_section:
+                            # Regular conda package
+                            match = _PKG_NAME_RE.match(dep)
+                            if match and match.group(1) != 'python':
+                                packages.append(canonical_name(match.group(1)))
+                    elif prefix == '  - ' and in_pip_section:
+                        # pip package under dependencies
+                        dep = line[4:].strip()
+                        match = _PKG_NAME_RE.match(dep)
+                        if match:
+                            packages.append(canonical_name(match.group(1)))
+
         except Exception as e:
             print(f"Error parsing conda environment file: {e}")
-        
+
         return packages
 
+    def _site_packages_dir(self, python_executable: str) -> Optional[str]:
+        """Resolve (and cache) the site-packages directory of an interpreter."""
+        if python_executable not in self._site_packages_cache:
+            sp_dir = None
+            try:
+                if os.path.realpath(python_executable) == os.path.realpath(sys.executable):
+                    # Running interpreter: answer in-process — each CLI run
+                    # is a fresh process, so a subprocess here would cost a
+                    # full startup on every same-interpreter deps check
+                    import site
+                    sp_dir = site.getsitepackages()[0]
+                else:
+                    result = subprocess.run(
+                        [python_executable, "-c", "import site;print(site.getsitepackages()[0])"],
+                        capture_output=True, text=True, timeout=15)
+                    if result.returncode == 0:
+                        sp_dir = result.stdout.strip() or None
+            except Exception:
+                pass
+            self._site_packages_cache[python_executable] = sp_dir
+        return self._site_packages_cache[python_executable]
+
     def get_installed_packages(self, python_executable: str) -> Set[str]:
         """Get list of installed packages in the given Python environment."""
+        # Key the cache on site-packages mtime so installs and uninstalls
+        # (including ones made outside this process) invalidate the entry.
+        sp_dir = self._site_packages_dir(python_executable)
+        key = None
+        if sp_dir is not None:
+            try:
+                key = (python_executable, os.path.getmtime(sp_dir))
+            except OSError:
+                key = None
+        if key is not None and key in self._installed_cache:
+            return self._installed_cache[key]
+
         packages = set()
         try:
-            result = subprocess.run([python_executable, "-m", "pip", "list", "--format=freeze"], 
-                                 capture_output=True, text=True, timeout=30)
-            if result.returncode == 0:
-                for line in result.stdout.strip().split('\n'):
-                    if '==' in line:
-                        package_name = line.split('==')[0].lower()
-                        packages.add(package_name)
+            if os.path.realpath(python_executable) == os.path.realpath(sys.executable):
+                # Same interpreter: enumerate in-process, skipping both the
+                # subprocess startup and pip's import cost entirely.
+                for dist in importlib.metadata.distributions():
+                    packages.add(canonical_name(dist.metadata['Name']))
+            else:
+                # Foreign interpreter: a short -c probe that never imports pip
+                result = subprocess.run(
+                    [python_executable, "-c",
+                     "import importlib.metadata\n"
+                     "for d in importlib.metadata.distributions():\n"
+                     "    print(d.metadata['Name'])"],
+                    capture_output=True, text=True, timeout=30)
+                if result.returncode == 0:
+                    for name in result.stdout.splitlines():
+                        if name:
+                            packages.add(canonical_name(name))
         except Exception as e:
             print(f"Error getting installed packages: {e}")
-        
+
+        packages = frozenset(packages)
+        if key is not None:
+            self._installed_cache[key] = packages
         return packages
 
+    def _install_parallel(self, python_exe: str, missing_packages: List[str]) -> bool:
+        """Install packages via several concurrent pip processes."""
+        shards = min(4, os.cpu_count() or 1, len(missing_packages))
+        groups = [missing_packages[i::shards] for i in range(shards)]
+
+        print(f"Installing {len(missing_packages)} packages across {shards} parallel pip runs...")
+        try:
+            procs = [
+                subprocess.Popen([python_exe, "-m", "pip", "install",
+                                  "--no-cache-dir", "--prefer-binary"] + group)
+                for group in groups
+            ]
+            return all(proc.wait() == 0 for proc in procs)
+        except Exception as e:
+            print(f"⚠️  Parallel installation error: {e}")
+            return False
+
     def install_missing_dependencies(self, python_exe: str, missing_packages: List[str]) -> bool:
         """Install missing dependencies using pip."""
         if not missing_packages:
             return True
-        
+
+        # Large sets: shard across parallel pip runs so wheel downloads and
+        # installs overlap, falling back to one serial install on failure.
+        if len(missing_packages) > 4:
+            if self._install_parallel(python_exe, missing_packages):
+                print(f"✅ Successfully installed {len(missing_packages)} packages!")
+                self._installed_cache.clear()
+                return True
+            print("⚠️  Parallel installation failed, retrying with a single pip run...")
+
         try:
             cmd = [python_exe, "-m", "pip", "install", "--no-cache-dir"] + missing_packages
             print(f"Running: {' '.join(cmd)}")
@@ -167,6 +275,8 @@ class DependencyManager:
             
             if result.returncode == 0:
                 print(f"✅ Successfully installed {len(missing_packages)} packages!")
+                # Drop cached package sets so the next query sees the installs
+                self._installed_cache.clear()
                 return True
             else:
                 print(f"❌ Installation failed with return code {result.returncode}")
@@ -182,31 +292,22 @@ class DependencyManager:
             return True
         
         try:
-            cmd = ['conda', 'install', '-n', conda_env_name, '-y'] + missing_packages
+            # Offer defaults and conda-forge in one invocation so the solver
+            # consults both channels in a single solve, instead of running a
+            # full second solve after a "not found in defaults" failure.
+            cmd = ['conda', 'install', '-n', conda_env_name,
+                   '-c', 'conda-forge', '-c', 'defaults', '-y'] + missing_packages
             print(f"Running: {' '.join(cmd)}")
-            
+
             result = subprocess.run(cmd, capture_output=False, text=True)
-            
+
             if result.returncode == 0:
                 print(f"✅ Successfully installed {len(missing_packages)} packages in conda environment!")
                 return True
             else:
                 print(f"❌ Conda installation failed with return code {result.returncode}")
-                print("   Trying with conda-forge channel...")
-                
-                # Try with conda-forge channel
-                cmd = ['conda', 'install', '-n', conda_env_name, '-c', 'conda-forge', '-y'] + missing_packages
-                print(f"Running: {' '.join(cmd)}")
-                
-                result = subprocess.run(cmd, capture_output=False, text=True)
-                
-                if result.returncode == 0:
-                    print(f"✅ Successfully installed {len(missing_packages)} packages via conda-forge!")
-                    return True
-                else:
-                    print(f"❌ Conda installation failed even with conda-forge channel")
-                    return False
-                
+                return False
+
         except Exception as e:
             print(f"❌ Error during conda installation: {e}")
             return False
@@ -226,15 +327,44 @@ class DependencyManager:
 
     def find_requirements_file(self, script_dir: Path) -> Optional[str]:
         """Find the first existing requirements file in the script directory."""
-        for req_file in self.get_requirements_files(script_dir):
-            if req_file.exists():
+        # Key the cache on the directory's mtime so adding or removing a
+        # requirements file invalidates the memoized answer.
+        try:
+            dir_mtime = os.stat(script_dir).st_mtime_ns
+        except OSError:
+            return None
+        return self._find_req_cached(str(script_dir), dir_mtime)
+
+    @functools.lru_cache(maxsize=128)
+    def _find_req_cached(self, script_dir: str, dir_mtime: int) -> Optional[str]:
+        # One directory read instead of a stat syscall per candidate name
+        try:
+            names = {entry.name for entry in os.scandir(script_dir)}
+        except OSError:
+            return None
+        for req_file in self.get_requirements_files(Path(script_dir)):
+            if req_file.name in names:
                 return str(req_file)
         return None
 
     def parse_requirements_file(self, requirements_file: str) -> List[str]:
         """Parse a requirements file based on its type and return package names."""
+        try:
+            st = os.stat(requirements_file)
+        except OSError:
+            return list(dict.fromkeys(self._parse_requirements_uncached(requirements_file)))
+        return list(self._parse_req_cached(os.path.abspath(requirements_file),
+                                           st.st_mtime_ns, st.st_size))
+
+    @functools.lru_cache(maxsize=128)
+    def _parse_req_cached(self, requirements_file: str, mtime: int, size: int) -> tuple:
+        # Names are canonical by this point, so dict.fromkeys dedupes
+        # duplicate requirements while keeping the file's ordering.
+        return tuple(dict.fromkeys(self._parse_requirements_uncached(requirements_file)))
+
+    def _parse_requirements_uncached(self, requirements_file: str) -> List[str]:
         req_path = Path(requirements_file)
-        
+
         if req_path.name == 'requirements.txt':
             return self.parse_requirements_txt(requirements_file)
         elif req_path.name == 'pyproject.toml':
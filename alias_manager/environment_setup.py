@@ -6,20 +6,78 @@ Handles creation of virtual environments and conda environments.
 import os
 import sys
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
-from .venv_detector import VenvDetector
-from .dependency_manager import DependencyManager
-
 
 class EnvironmentSetup:
     """Handles creation and setup of Python virtual environments and conda environments."""
-    
+
+    # `conda env list` costs 200-400 ms per spawn; reuse its output briefly
+    _CONDA_ENVS_TTL = 30.0
+
     def __init__(self):
-        self.venv_detector = VenvDetector()
+        # Imported here rather than at module top so importing this module
+        # (e.g. via the package namespace) stays cheap until setup is
+        # actually requested
+        from .venv_detector import get_detector
+        from .dependency_manager import DependencyManager
+
+        self.venv_detector = get_detector()
         self.dependency_manager = DependencyManager()
-    
+        self._conda_envs_cache = None
+        self._conda_envs_time = 0.0
+
+    def _conda_env_list(self) -> Optional[str]:
+        """Return `conda env list` output, cached for a short TTL."""
+        now = time.monotonic()
+        if self._conda_envs_cache is not None and now - self._conda_envs_time < self._CONDA_ENVS_TTL:
+            return self._conda_envs_cache
+
+        output = None
+        try:
+            result = subprocess.run(['conda', 'env', 'list'],
+                                  capture_output=True, text=True, timeout=30)
+            if result.returncode == 0:
+                output = result.stdout
+        except Exception:
+            output = None
+
+        self._conda_envs_cache = output
+        self._conda_envs_time = now
+        return output
+
+    def _invalidate_conda_env_cache(self):
+        """Drop the cached `conda env list` output after creating/removing envs."""
+        self._conda_envs_cache = None
+
+    @staticmethod
+    def _parse_conda_env_names(output: str) -> set:
+        """Parse `conda env list` output into a set of environment names."""
+        names = set()
+        for line in output.splitlines():
+            if line.startswith('#'):
+                continue
+            parts = line.split()
+            if parts:
+                names.add(parts[0])
+        return names
+
+    def _conda_env_exists(self, conda_env_name: str) -> bool:
+        """Check whether a named conda environment exists."""
+        # Prefer conda's on-disk records (environments.txt, envs/); they
+        # answer in microseconds where the subprocess takes ~half a second.
+        env_names = self.venv_detector.list_conda_envs()
+        if env_names is not None:
+            return conda_env_name in env_names
+
+        output = self._conda_env_list()
+        if not output:
+            return False
+        return conda_env_name in self._parse_conda_env_names(output)
+
     def create_virtual_environment(self, script_path: str) -> Optional[str]:
         """Create a virtual environment for a script if it doesn't exist."""
         script_dir = Path(script_path).parent
@@ -43,17 +101,27 @@ class EnvironmentSetup:
             
             print(f"✅ Virtual environment created successfully!")
             
-            # Upgrade pip in the new environment
+            # Upgrade pip in the new environment, but only when the bundled
+            # copy is actually old — modern venvs ship a recent pip and the
+            # upgrade subprocess costs several seconds.
             venv_python = self.venv_detector.get_venv_python_from_path(venv_path)
-            if venv_python:
+            if venv_python and self._pip_needs_upgrade(venv_python, script_dir):
                 print("🔧 Upgrading pip in virtual environment...")
-                pip_result = subprocess.run([venv_python, "-m", "pip", "install", "--upgrade", "pip"], 
-                                          capture_output=True, text=True, timeout=60, cwd=str(script_dir))
+                # Only the return code matters here; discarding the output
+                # skips the pipe reads and string decoding entirely
+                pip_result = subprocess.run([venv_python, "-m", "pip", "install", "--upgrade", "pip"],
+                                          stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                          timeout=60, cwd=str(script_dir))
                 if pip_result.returncode == 0:
                     print("✅ Pip upgraded successfully!")
                 else:
                     print("⚠️  Pip upgrade failed, but virtual environment is ready")
-            
+
+            # Drop cached detection results so callers re-detecting this
+            # script directory see the new environment, whichever path
+            # created it
+            self.venv_detector.clear_cache()
+
             return str(venv_path)
             
         except subprocess.TimeoutExpired:
@@ -63,6 +131,23 @@ class EnvironmentSetup:
             print(f"❌ Error creating virtual environment: {e}")
             return None
 
+    # Bundled pip versions at or above this are considered fresh enough
+    _MIN_PIP_MAJOR = 23
+
+    def _pip_needs_upgrade(self, venv_python: str, script_dir: Path) -> bool:
+        """Return True when the venv's pip is older than the version floor."""
+        try:
+            result = subprocess.run([venv_python, "-m", "pip", "--version"],
+                                  capture_output=True, text=True, timeout=30, cwd=str(script_dir))
+            if result.returncode == 0:
+                # Output looks like: "pip 24.0 from ... (python 3.12)"
+                major = int(result.stdout.split()[1].split('.')[0])
+                return major < self._MIN_PIP_MAJOR
+        except Exception:
+            pass
+        # Could not determine the version; attempt the upgrade as before
+        return True
+
     def create_conda_environment(self, script_path: str, env_file: str) -> bool:
         """Create a conda environment from an environment.yml file."""
         if not self.venv_detector.check_conda_available():
@@ -87,25 +172,25 @@ class EnvironmentSetup:
         
         try:
             # Check if environment already exists
-            result = subprocess.run(['conda', 'env', 'list'], 
-                                  capture_output=True, text=True, timeout=30)
-            if result.returncode == 0 and env_name in result.stdout:
-                # More precise check - environment name should be at start of line
-                for line in result.stdout.split('\n'):
-                    if line.strip().startswith(env_name):
-                        print(f"✅ Conda environment '{env_name}' already exists")
-                        return True
-            
+            if self._conda_env_exists(env_name):
+                print(f"✅ Conda environment '{env_name}' already exists")
+                return True
+
             # Create conda environment from file
             print(f"🔄 Running: conda env create -f {env_file}")
-            result = subprocess.run(['conda', 'env', 'create', '-f', env_file], 
+            result = subprocess.run(['conda', 'env', 'create', '-f', env_file],
                                   capture_output=False, text=True, timeout=300, cwd=str(script_dir))
-            
+            self._invalidate_conda_env_cache()
+
             if result.returncode != 0:
                 print(f"❌ Failed to create conda environment")
                 print("   Try creating the environment manually with: conda env create -f environment.yml")
                 return False
             
+            # As for venvs: invalidate detection so re-detection sees the
+            # new environment regardless of which caller created it
+            self.venv_detector.clear_cache()
+
             print(f"✅ Conda environment '{env_name}' created successfully!")
             return True
             
@@ -128,9 +213,16 @@ class EnvironmentSetup:
         if force_recreate:
             print("🔄 Force recreate mode: Will remove existing environment and recreate from scratch")
         print("-" * 60)
-        
-        # Detect current environment and requirements
-        venv_info = self.venv_detector.detect_venv(script_path)
+
+        # Detect current environment and requirements.  Venv detection and
+        # the conda env listing are independent subprocess probes, so run
+        # them concurrently; the conda listing lands in the TTL cache for
+        # the existence checks below.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            venv_future = pool.submit(self.venv_detector.detect_venv, script_path)
+            if self.venv_detector.check_conda_available():
+                pool.submit(self._conda_env_list)
+            venv_info = venv_future.result()
         script_dir = Path(script_path).parent
         
         # Check for requirements files
@@ -145,6 +237,29 @@ class EnvironmentSetup:
         
         print(f"📋 Found requirements file: {requirements_file}")
         req_path = Path(requirements_file)
+
+        # Fast path: a sentinel inside the venv records the requirements
+        # mtime of the last successful setup.  When it matches, everything
+        # below (parse, package enumeration, install) would be a no-op, so
+        # answer from the single stat instead.  Deleting the venv removes
+        # the sentinel with it.
+        sentinel = script_dir / '.venv' / '.alias_manager_setup_ok'
+        try:
+            req_mtime = os.stat(requirements_file).st_mtime_ns
+        except OSError:
+            req_mtime = None
+        if force_recreate:
+            try:
+                sentinel.unlink()
+            except OSError:
+                pass
+        elif req_mtime is not None:
+            try:
+                if sentinel.read_text().strip() == str(req_mtime):
+                    print("✅ Environment already set up for this requirements file (cached)")
+                    return True
+            except OSError:
+                pass
         
         # Determine environment type based on file
         is_conda_file = req_path.name in ['environment.yml', 'environment.yaml', 'conda.yml', 'conda.yaml']
@@ -213,7 +328,8 @@ class EnvironmentSetup:
                 venv_created = True
                 print("✅ Virtual environment created successfully!")
             
-            # Re-detect environment after creation
+            # Re-detect environment after creation (dropping stale cache)
+            self.venv_detector.clear_cache()
             venv_info = self.venv_detector.detect_venv(script_path)
         else:
             if venv_info and venv_info.get('type') == 'venv':
@@ -248,6 +364,13 @@ class EnvironmentSetup:
             
             print("✅ All dependencies installed successfully!")
         
+        # Record the successful setup so unchanged repeats short-circuit
+        if req_mtime is not None:
+            try:
+                sentinel.write_text(str(req_mtime))
+            except OSError:
+                pass
+
         print(f"\n🎉 Setup complete! Environment is ready to use.")
         return True
 
@@ -263,19 +386,7 @@ class EnvironmentSetup:
             # For conda environments, check if they actually exist in conda
             conda_env_name = venv_info.get('conda_env_name')
             if conda_env_name and self.venv_detector.check_conda_available():
-                try:
-                    result = subprocess.run(['conda', 'env', 'list'], 
-                                          capture_output=True, text=True, timeout=30)
-                    if result.returncode == 0:
-                        # Check if environment name appears as a separate word (not just substring)
-                        for line in result.stdout.split('\n'):
-                            if conda_env_name in line and not line.startswith('#'):
-                                # More precise check - environment name should be at start of line
-                                if line.strip().startswith(conda_env_name):
-                                    has_venv = True
-                                    break
-                except Exception:
-                    has_venv = False
+                has_venv = self._conda_env_exists(conda_env_name)
         
         return has_venv
 
@@ -291,28 +402,21 @@ class EnvironmentSetup:
         
         try:
             # Check if environment exists
-            result = subprocess.run(['conda', 'env', 'list'], 
-                                  capture_output=True, text=True, timeout=30)
-            if result.returncode != 0:
+            if self._conda_env_list() is None:
                 print("❌ Failed to list conda environments")
                 return False
-            
-            env_exists = False
-            for line in result.stdout.split('\n'):
-                if line.strip().startswith(conda_env_name):
-                    env_exists = True
-                    break
-            
-            if not env_exists:
+
+            if not self._conda_env_exists(conda_env_name):
                 print(f"ℹ️  Conda environment '{conda_env_name}' does not exist or was already removed")
                 return True
-            
+
             print(f"🗑️  Removing conda environment '{conda_env_name}'...")
-            
+
             # Remove conda environment
-            result = subprocess.run(['conda', 'env', 'remove', '-n', conda_env_name, '-y'], 
+            result = subprocess.run(['conda', 'env', 'remove', '-n', conda_env_name, '-y'],
                                   capture_output=False, text=True, timeout=120)
-            
+            self._invalidate_conda_env_cache()
+
             if result.returncode == 0:
                 print(f"✅ Conda environment '{conda_env_name}' removed successfully!")
                 return True
@@ -344,6 +448,7 @@ class EnvironmentSetup:
             print(f"🗑️  Removing virtual environment at '{venv_path}'...")
             import shutil
             shutil.rmtree(venv_path_obj)
+            self.venv_detector.clear_cache()
             print(f"✅ Virtual environment removed successfully!")
             return True
         except Exception as e:
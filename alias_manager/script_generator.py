@@ -3,156 +3,256 @@ Script generation for Python Alias Manager.
 Handles creation of batch files and shell scripts for cross-platform alias execution.
 """
 
+import os
 import sys
 from pathlib import Path
 from typing import Dict, Optional
 
-from .venv_detector import VenvDetector
+from .venv_detector import get_detector
+
+
+# Script templates, hoisted to module constants so each alias creation only
+# pays for a small .format substitution instead of re-building multi-KB
+# strings, with rendered output cached per substitution set below.
+
+# Launching the venv's python directly is equivalent to activating first
+# (site.py picks up the venv's site-packages from pyvenv.cfg) and skips the
+# activate.bat sub-cmd, which costs 100-300 ms per invocation on Windows
+_VENV_BATCH_TEMPLATE = '''@echo off
+if exist "{venv_python}" (
+    "{venv_python}" "{script_path}" %*
+) else (
+    echo Error: Virtual environment Python not found at {venv_python}
+    echo Falling back to system Python...
+    python "{script_path}" %*
+)
+'''
+
+_SYSTEM_BATCH_TEMPLATE = '''@echo off
+python "{script_path}" %*
+'''
+
+_CONDA_BATCH_TEMPLATE = '''@echo off
+conda run --no-capture-output -n {conda_env_name} python "{script_path}" %*
+'''
+
+# Running the environment's python directly skips conda's own startup
+# (typically several hundred ms); conda run remains the fallback for when
+# the environment has moved or been removed
+_CONDA_DIRECT_BATCH_TEMPLATE = '''@echo off
+if exist "{conda_python}" (
+    "{conda_python}" "{script_path}" %*
+) else (
+    conda run --no-capture-output -n {conda_env_name} python "{script_path}" %*
+)
+'''
+
+# Interpreter selection defined once as a shell function rather than an
+# if/elif block pasted at every call site — bash parses far fewer lines
+# per alias invocation
+_PY_SELECT_FN = '''_pam_py(){{ if command -v python3 >/dev/null 2>&1; then exec python3 "$@"; else exec python "$@"; fi; }}
+'''
+
+_VENV_SHELL_TEMPLATE = '''#!/bin/bash
+''' + _PY_SELECT_FN + '''# Paths are pre-converted to WSL form at alias-creation time, so no
+# per-invocation wslpath subprocess is needed
+if [[ -n "${{WSL_DISTRO_NAME:-}}" ]]; then
+    # We're in WSL - use the precomputed WSL-form paths
+    SCRIPT_PATH="{wsl_script_path}"
+    ACTIVATE_SCRIPT="{wsl_activate_script}"
+else
+    # We're in regular Linux/macOS or Git Bash
+    SCRIPT_PATH="{script_path}"
+    ACTIVATE_SCRIPT="{activate_script}"
+fi
+
+# Source the activation script (when present) and run Python
+if [[ -f "$ACTIVATE_SCRIPT" ]]; then
+    source "$ACTIVATE_SCRIPT"
+fi
+_pam_py "$SCRIPT_PATH" "$@"
+'''
+
+_CONDA_SHELL_TEMPLATE = '''#!/bin/bash
+# Script path is pre-converted to WSL form at alias-creation time
+if [[ -n "${{WSL_DISTRO_NAME:-}}" ]]; then
+    # We're in WSL - use the precomputed WSL-form path
+    SCRIPT_PATH="{wsl_script_path}"
+else
+    # We're in regular Linux/macOS or Git Bash
+    SCRIPT_PATH="{script_path}"
+fi
+
+# Check if conda is available
+if command -v conda &> /dev/null; then
+    # Use conda to run the script in the specified environment
+    # Use --no-capture-output to ensure stdin/stdout/stderr are properly forwarded
+    exec conda run --no-capture-output -n {conda_env_name} python "$SCRIPT_PATH" "$@"
+else
+    echo "Error: Conda is not available in PATH"
+    echo "Please install Anaconda/Miniconda or ensure conda is in your PATH"
+    exit 1
+fi
+'''
+
+_CONDA_DIRECT_SHELL_TEMPLATE = '''#!/bin/bash
+# Script path is pre-converted to WSL form at alias-creation time
+if [[ -n "${{WSL_DISTRO_NAME:-}}" ]]; then
+    # We're in WSL - use the precomputed WSL-form path
+    SCRIPT_PATH="{wsl_script_path}"
+else
+    # We're in regular Linux/macOS or Git Bash
+    SCRIPT_PATH="{script_path}"
+fi
+
+# Run the environment's Python directly; fall back to conda run when the
+# environment has moved or been removed
+if [[ -x "{conda_python}" ]]; then
+    exec "{conda_python}" "$SCRIPT_PATH" "$@"
+elif command -v conda &> /dev/null; then
+    exec conda run --no-capture-output -n {conda_env_name} python "$SCRIPT_PATH" "$@"
+else
+    echo "Error: Conda is not available in PATH"
+    echo "Please install Anaconda/Miniconda or ensure conda is in your PATH"
+    exit 1
+fi
+'''
+
+_SYSTEM_SHELL_HEAD = '''#!/bin/bash
+# Script path is pre-converted to WSL form at alias-creation time
+if [[ -n "${{WSL_DISTRO_NAME:-}}" ]]; then
+    # We're in WSL - use the precomputed WSL-form path
+    SCRIPT_PATH="{wsl_script_path}"
+else
+    # We're in regular Linux/macOS or Git Bash
+    SCRIPT_PATH="{script_path}"
+fi
+
+'''
+
+# Try python3 first, then python, then fall back to the sys.executable
+# path recorded at alias-creation time (may not work in WSL)
+_SYSTEM_SHELL_TEMPLATE = _SYSTEM_SHELL_HEAD + '''_pam_py(){{ if command -v python3 >/dev/null 2>&1; then exec python3 "$@"; elif command -v python >/dev/null 2>&1; then exec python "$@"; else exec "{sys_executable}" "$@"; fi; }}
+_pam_py "$SCRIPT_PATH" "$@"
+'''
+
+# When the generating interpreter is /usr/bin/python3, the sys.executable
+# fallback duplicates the `command -v python3` branch — omit it
+_SYSTEM_SHELL_TEMPLATE_NO_FALLBACK = _SYSTEM_SHELL_HEAD + _PY_SELECT_FN + '''_pam_py "$SCRIPT_PATH" "$@"
+'''
+
+# Resolved once at import rather than per generated script
+_SYS_EXECUTABLE = sys.executable
+
+_RENDER_CACHE = {}
+
+
+def _render(template: str, **subs) -> str:
+    """Format a script template, reusing the rendered string for repeated
+    aliases with identical substitutions."""
+    key = (template, tuple(sorted(subs.items())))
+    content = _RENDER_CACHE.get(key)
+    if content is None:
+        content = _RENDER_CACHE[key] = template.format(**subs)
+    return content
 
 
 class ScriptGenerator:
     """Generates batch files and shell scripts for Python script aliases."""
-    
+
     def __init__(self, batch_dir: Path):
         self.batch_dir = batch_dir
-        self.venv_detector = VenvDetector()
-    
+        # Shared instance: detection caches survive across generators
+        self.venv_detector = get_detector()
+
+    @staticmethod
+    def _unchanged(path: Path, content: str) -> bool:
+        """Return True when the file already holds exactly this content."""
+        # Byte comparison: no decode pass, and a script with mangled
+        # encoding on disk reads as "changed" instead of raising
+        try:
+            return path.read_bytes() == content.encode()
+        except OSError:
+            return False
+
+    @staticmethod
+    def _write_atomic(path: Path, content: str, mode: int = None):
+        """Write content via a temp file and rename so a crash or a
+        concurrent alias run can never leave a half-written script."""
+        tmp = path.with_name(path.name + '.tmp')
+        tmp.write_text(content)
+        if mode is not None:
+            tmp.chmod(mode)
+        os.replace(tmp, path)
+
+
     def create_batch_file(self, alias_name: str, script_path: str, venv_info_override: Dict[str, str] = None):
         """Create a batch file for the alias (Windows)."""
         batch_file = self.batch_dir / f"{alias_name}.bat"
-        
+
         # Use override if provided, otherwise detect virtual environment
         venv_info = venv_info_override or self.venv_detector.detect_venv(script_path)
-        
+
         if venv_info and venv_info.get('type') == 'venv':
-            # Use virtual environment with activation-based approach
-            venv_path = venv_info.get('path')
-            if venv_path:
-                # Create batch file that activates venv and uses the activated Python
-                batch_content = f'''@echo off
-if exist "{venv_path}\\Scripts\\activate.bat" (
-    call "{venv_path}\\Scripts\\activate.bat" >nul 2>&1
-    python "{script_path}" %*
-) else (
-    echo Error: Virtual environment activation script not found at {venv_path}\\Scripts\\activate.bat
-    echo Falling back to system Python...
-    python "{script_path}" %*
-)
-'''
+            # Use the virtual environment's Python directly
+            venv_python = self.venv_detector.get_venv_python_executable(venv_info)
+            if venv_python:
+                batch_content = _render(_VENV_BATCH_TEMPLATE,
+                                        venv_python=venv_python, script_path=script_path)
             else:
                 # Fallback to system Python
-                batch_content = f'''@echo off
-python "{script_path}" %*
-'''
+                batch_content = _render(_SYSTEM_BATCH_TEMPLATE, script_path=script_path)
         elif venv_info and venv_info.get('type') == 'conda':
             # Use conda environment
             conda_env_name = venv_info.get('conda_env_name')
             if conda_env_name and self.venv_detector.check_conda_available():
-                # Create batch file content with conda run (no initialization required)
-                # Use --no-capture-output to ensure stdin/stdout/stderr are properly forwarded
-                batch_content = f'''@echo off
-conda run --no-capture-output -n {conda_env_name} python "{script_path}" %*
-'''
+                # Prefer the environment's python resolved at creation time;
+                # otherwise conda run (--no-capture-output ensures
+                # stdin/stdout/stderr are properly forwarded)
+                conda_python = self.venv_detector.get_conda_python_executable(venv_info)
+                if conda_python:
+                    batch_content = _render(_CONDA_DIRECT_BATCH_TEMPLATE,
+                                            conda_python=conda_python,
+                                            conda_env_name=conda_env_name,
+                                            script_path=script_path)
+                else:
+                    batch_content = _render(_CONDA_BATCH_TEMPLATE,
+                                            conda_env_name=conda_env_name,
+                                            script_path=script_path)
             else:
                 # Fallback to system Python if conda not available or no env name
-                batch_content = f'''@echo off
-python "{script_path}" %*
-'''
+                batch_content = _render(_SYSTEM_BATCH_TEMPLATE, script_path=script_path)
         else:
             # Use system Python with dynamic detection
-            batch_content = f'''@echo off
-python "{script_path}" %*
-'''
-        
-        with open(batch_file, 'w') as f:
-            f.write(batch_content)
-        
+            batch_content = _render(_SYSTEM_BATCH_TEMPLATE, script_path=script_path)
+
+        # Skip the write when a regeneration produced identical content
+        # (e.g. the post-venv-creation update after add_alias)
+        if not self._unchanged(batch_file, batch_content):
+            self._write_atomic(batch_file, batch_content)
+
         return batch_file
 
     def create_shell_script(self, alias_name: str, script_path: str, venv_info_override: Dict[str, str] = None):
         """Create a shell script for the alias (Linux/macOS/Bash)."""
         shell_file = self.batch_dir / alias_name
-        
+
         # Use override if provided, otherwise detect virtual environment
         venv_info = venv_info_override or self.venv_detector.detect_venv(script_path)
-        
+
         if venv_info and venv_info.get('type') == 'venv':
             # Use virtual environment Python
             venv_python = self.venv_detector.get_venv_python_executable(venv_info)
             activate_script = venv_info.get('activate_script', '')
-            
+
             if venv_python and activate_script:
-                # Create shell script content with venv activation
-                shell_content = f'''#!/bin/bash
-# Auto-detect Python executable and script path based on environment
-if [[ "${{PWD}}" == /mnt/* ]] || command -v wslpath &> /dev/null; then
-    # We're in WSL - use Linux Python and convert Windows paths
-    if [[ "{script_path}" == [A-Za-z]:* ]]; then
-        # Convert Windows path to WSL path
-        SCRIPT_PATH=$(wslpath "{script_path}")
-    else
-        SCRIPT_PATH="{script_path}"
-    fi
-    
-    # Try to find and activate the virtual environment
-    if [[ "{activate_script}" == [A-Za-z]:* ]]; then
-        ACTIVATE_SCRIPT=$(wslpath "{activate_script}")
-    else
-        ACTIVATE_SCRIPT="{activate_script}"
-    fi
-    
-    # Source the activation script and run Python
-    if [[ -f "$ACTIVATE_SCRIPT" ]]; then
-        source "$ACTIVATE_SCRIPT"
-        # Try python3 first, then python after activation
-        if command -v python3 &> /dev/null; then
-            python3 "$SCRIPT_PATH" "$@"
-        elif command -v python &> /dev/null; then
-            python "$SCRIPT_PATH" "$@"
-        else
-            echo "Error: No Python interpreter found after activating virtual environment"
-            exit 1
-        fi
-    else
-        # Fallback to system Python
-        if command -v python3 &> /dev/null; then
-            python3 "$SCRIPT_PATH" "$@"
-        elif command -v python &> /dev/null; then
-            python "$SCRIPT_PATH" "$@"
-        else
-            echo "Error: No Python interpreter found"
-            exit 1
-        fi
-    fi
-else
-    # We're in regular Linux/macOS or Git Bash
-    SCRIPT_PATH="{script_path}"
-    
-    # Activate virtual environment if available
-    if [[ -f "{activate_script}" ]]; then
-        source "{activate_script}"
-        # Try python3 first, then python after activation
-        if command -v python3 &> /dev/null; then
-            python3 "$SCRIPT_PATH" "$@"
-        elif command -v python &> /dev/null; then
-            python "$SCRIPT_PATH" "$@"
-        else
-            echo "Error: No Python interpreter found after activating virtual environment"
-            exit 1
-        fi
-    else
-        # Fallback to system Python
-        if command -v python3 &> /dev/null; then
-            python3 "$SCRIPT_PATH" "$@"
-        elif command -v python &> /dev/null; then
-            python "$SCRIPT_PATH" "$@"
-        else
-            echo "Error: No Python interpreter found"
-            exit 1
-        fi
-    fi
-fi
-'''
+                # Shell script that activates the venv before running
+                shell_content = _render(
+                    _VENV_SHELL_TEMPLATE,
+                    script_path=script_path,
+                    activate_script=activate_script,
+                    wsl_script_path=self.venv_detector.win_to_wsl(script_path),
+                    wsl_activate_script=self.venv_detector.win_to_wsl(activate_script))
             else:
                 # Fallback to system Python
                 shell_content = self._create_system_python_shell_script(script_path)
@@ -160,74 +260,44 @@ fi
             # Use conda environment
             conda_env_name = venv_info.get('conda_env_name')
             if conda_env_name and self.venv_detector.check_conda_available():
-                # Create shell script content with conda activation
-                shell_content = f'''#!/bin/bash
-# Auto-detect script path based on environment
-if [[ "${{PWD}}" == /mnt/* ]] || command -v wslpath &> /dev/null; then
-    # We're in WSL - convert Windows paths
-    if [[ "{script_path}" == [A-Za-z]:* ]]; then
-        # Convert Windows path to WSL path
-        SCRIPT_PATH=$(wslpath "{script_path}")
-    else
-        SCRIPT_PATH="{script_path}"
-    fi
-else
-    # We're in regular Linux/macOS or Git Bash
-    SCRIPT_PATH="{script_path}"
-fi
-
-# Check if conda is available
-if command -v conda &> /dev/null; then
-    # Use conda to run the script in the specified environment
-    # Use --no-capture-output to ensure stdin/stdout/stderr are properly forwarded
-    conda run --no-capture-output -n {conda_env_name} python "$SCRIPT_PATH" "$@"
-else
-    echo "Error: Conda is not available in PATH"
-    echo "Please install Anaconda/Miniconda or ensure conda is in your PATH"
-    exit 1
-fi
-'''
+                # Prefer the environment's python resolved at creation time;
+                # conda run stays as the in-script fallback
+                conda_python = self.venv_detector.get_conda_python_executable(venv_info)
+                if conda_python:
+                    shell_content = _render(
+                        _CONDA_DIRECT_SHELL_TEMPLATE,
+                        script_path=script_path,
+                        conda_python=conda_python,
+                        conda_env_name=conda_env_name,
+                        wsl_script_path=self.venv_detector.win_to_wsl(script_path))
+                else:
+                    shell_content = _render(
+                        _CONDA_SHELL_TEMPLATE,
+                        script_path=script_path,
+                        conda_env_name=conda_env_name,
+                        wsl_script_path=self.venv_detector.win_to_wsl(script_path))
             else:
                 # Fallback to system Python if conda not available or no env name
                 shell_content = self._create_system_python_shell_script(script_path)
         else:
             # Create shell script content without venv
             shell_content = self._create_system_python_shell_script(script_path)
-        
-        with open(shell_file, 'w') as f:
-            f.write(shell_content)
-        
-        # Make the shell script executable
-        shell_file.chmod(0o755)
-        
+
+        # Skip the write (and chmod) when regeneration produced identical content
+        if not self._unchanged(shell_file, shell_content):
+            # chmod happens on the temp file so the script appears
+            # executable atomically
+            self._write_atomic(shell_file, shell_content, mode=0o755)
+
         return shell_file
-    
+
     def _create_system_python_shell_script(self, script_path: str) -> str:
         """Create a shell script that uses system Python with cross-platform path handling."""
-        return f'''#!/bin/bash
-# Auto-detect Python executable and script path based on environment
-if [[ "${{PWD}}" == /mnt/* ]] || command -v wslpath &> /dev/null; then
-    # We're in WSL - use Linux Python and convert Windows paths
-    PYTHON_CMD="python3"
-    if [[ "{script_path}" == [A-Za-z]:* ]]; then
-        # Convert Windows path to WSL path
-        SCRIPT_PATH=$(wslpath "{script_path}")
-    else
-        SCRIPT_PATH="{script_path}"
-    fi
-else
-    # We're in regular Linux/macOS or Git Bash - use system Python
-    PYTHON_CMD="python3"
-    SCRIPT_PATH="{script_path}"
-fi
-
-# Try python3 first, then python, then fall back to sys.executable path
-if command -v python3 &> /dev/null; then
-    "$PYTHON_CMD" "$SCRIPT_PATH" "$@"
-elif command -v python &> /dev/null; then
-    python "$SCRIPT_PATH" "$@"
-else
-    # Fallback to the original Python executable (may not work in WSL)
-    "{sys.executable}" "{script_path}" "$@"
-fi
-'''
+        wsl_script_path = self.venv_detector.win_to_wsl(script_path)
+        if _SYS_EXECUTABLE == '/usr/bin/python3':
+            return _render(_SYSTEM_SHELL_TEMPLATE_NO_FALLBACK,
+                           script_path=script_path, wsl_script_path=wsl_script_path)
+        return _render(_SYSTEM_SHELL_TEMPLATE,
+                       script_path=script_path,
+                       wsl_script_path=wsl_script_path,
+                       sys_executable=_SYS_EXECUTABLE)
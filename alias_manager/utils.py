@@ -4,40 +4,49 @@ Utility functions for cross-platform compatibility.
 
 import sys
 
+# Ask stdout to replace unencodable characters up front so the fallback
+# path in safe_print is rarely taken at all.
+try:
+    sys.stdout.reconfigure(errors='replace')
+except (AttributeError, ValueError):
+    pass
 
-def safe_print(*args, **kwargs):
-    """Print with safe Unicode handling for Windows."""
+# Precomputed translation table mapping Unicode symbols to their ASCII
+# equivalents; str.translate applies it in a single C-level pass.
+_UNICODE_TO_ASCII = str.maketrans({
+    '✓': '[OK]',
+    '⚠': '[!]',
+    '❌': '[X]',
+    '🎉': '[!]',
+    '🐍': '[Python]'
+})
+
+
+def _print_sanitized(*args, **kwargs):
+    """Print with Unicode symbols replaced by ASCII equivalents —
+    one translate pass instead of a replace call per symbol."""
+    print(*(arg.translate(_UNICODE_TO_ASCII) if isinstance(arg, str) else arg
+            for arg in args), **kwargs)
+
+
+def _print_fast(*args, **kwargs):
+    """Print directly, sanitizing only if the stream still refuses."""
     try:
         print(*args, **kwargs)
     except UnicodeEncodeError:
-        # Replace Unicode characters with ASCII equivalents on Windows
-        safe_args = []
-        for arg in args:
-            if isinstance(arg, str):
-                # Replace common Unicode symbols with ASCII equivalents
-                replacements = {
-                    '✓': '[OK]',
-                    '⚠': '[!]', 
-                    '❌': '[X]',
-                    '🎉': '[!]',
-                    '🐍': '[Python]'
-                }
-                for unicode_char, ascii_char in replacements.items():
-                    arg = arg.replace(unicode_char, ascii_char)
-            safe_args.append(arg)
-        print(*safe_args, **kwargs)
+        _print_sanitized(*args, **kwargs)
+
+
+# Pick the implementation once at import: terminals that cannot encode the
+# symbols (e.g. cp1252 on Windows) get the sanitizing printer up front,
+# instead of paying a partial write + exception unwind on every call.
+_NEEDS_SANITIZE = (getattr(sys.stdout, 'encoding', None) or '').lower() not in ('utf-8', 'utf8')
+
+safe_print = _print_sanitized if _NEEDS_SANITIZE else _print_fast
 
 
 def safe_unicode(text):
     """Convert Unicode text to safe ASCII on Windows."""
     if isinstance(text, str):
-        replacements = {
-            '✓': '[OK]',
-            '⚠': '[!]', 
-            '❌': '[X]',
-            '🎉': '[!]',
-            '🐍': '[Python]'
-        }
-        for unicode_char, ascii_char in replacements.items():
-            text = text.replace(unicode_char, ascii_char)
+        return text.translate(_UNICODE_TO_ASCII)
     return text
@@ -5,103 +5,157 @@ Handles detection of virtual environments (venv, conda) and project dependencies
 
 import os
 import re
+import shutil
 import subprocess
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Set
+
+
+# Matches the `name:` field of a conda environment file; compiled once
+# rather than per parsed line
+_CONDA_NAME_RE = re.compile(r'^name:\s*([^\s#]+)')
 
 
 class VenvDetector:
     """Detects and manages virtual environment information for Python scripts."""
-    
+
+    def __init__(self):
+        # Detection results per resolved script directory: every alias in a
+        # directory shares one stat-walk instead of repeating it
+        self._venv_cache = {}
+        # Parsed environment names keyed by (path, mtime, size) so the same
+        # environment.yml is not re-read for every alias pointing at it
+        self._env_name_cache = {}
+        # name -> prefix map from `conda info --envs`, loaded at most once
+        self._conda_envs_map = None
+
+    def clear_cache(self):
+        """Forget cached detection results (e.g. after creating a venv)."""
+        self._venv_cache.clear()
+
     def detect_venv(self, script_path: str) -> Optional[Dict[str, str]]:
         """Detect if there's a virtual environment associated with a script."""
         script_dir = Path(script_path).parent
-        
+        cache_key = str(script_dir.resolve())
+        if cache_key in self._venv_cache:
+            return self._venv_cache[cache_key]
+        venv_info = self._detect_venv_uncached(script_dir)
+        self._venv_cache[cache_key] = venv_info
+        return venv_info
+
+    @staticmethod
+    def win_to_wsl(path: str) -> str:
+        """Convert a Windows drive path to its WSL /mnt form.
+
+        The mapping is a fixed string rewrite (C:\\foo -> /mnt/c/foo), so
+        doing it here lets generated scripts skip the per-invocation
+        `wslpath` subprocess.  Non-Windows paths pass through unchanged.
+        """
+        if len(path) >= 2 and path[1] == ':' and path[0].isalpha():
+            return '/mnt/' + path[0].lower() + path[2:].replace('\\', '/')
+        return path
+
+    @staticmethod
+    def _probe_venv(venv_path: Path) -> Optional[tuple]:
+        """Probe a candidate venv directory with one directory read per layout.
+
+        Returns (activate_script, python_exe) paths as strings (either may
+        be None), or None when neither platform layout is present.
+        """
+        for subdir, activate_names, python_names in (
+                ('Scripts', ('activate', 'activate.bat'), ('python.exe', 'python')),  # Windows
+                ('bin', ('activate',), ('python', 'python3'))):                       # Linux/macOS
+            try:
+                names = {entry.name for entry in os.scandir(venv_path / subdir)}
+            except OSError:
+                continue
+            activate = next((n for n in activate_names if n in names), None)
+            python = next((n for n in python_names if n in names), None)
+            if activate or python:
+                return (str(venv_path / subdir / activate) if activate else None,
+                        str(venv_path / subdir / python) if python else None)
+        return None
+
+    # Common virtual environment directory names, in probe order
+    VENV_NAMES = ('venv', 'env', '.venv', '.env')
+
+    # Project files checked in the script directory, in priority order; a
+    # single directory listing is matched against these instead of one
+    # stat per candidate
+    CONDA_NAMES = ('environment.yml', 'environment.yaml', 'conda.yml', 'conda.yaml')
+    REQ_NAMES = ('requirements.txt', 'pyproject.toml', 'setup.py', 'poetry.lock')
+
+    def _probe_dir_for_venv(self, directory: Path) -> Optional[Dict[str, str]]:
+        """Probe one directory for a valid venv under any of VENV_NAMES."""
+        for venv_name in self.VENV_NAMES:
+            venv_path = directory / venv_name
+            probe = self._probe_venv(venv_path)
+            if probe and probe[0]:
+                return {
+                    'path': str(venv_path),
+                    'type': 'venv',
+                    'activate_script': probe[0],
+                }
+        return None
+
+    @staticmethod
+    def _walk_parent_dirs(script_dir: Path, max_levels: int = 3):
+        """Yield (level, dir) for up to max_levels parents of script_dir."""
+        parent_dir = script_dir.parent
+        for level in range(max_levels):
+            if parent_dir == parent_dir.parent:  # Reached root
+                break
+            yield level + 1, parent_dir
+            parent_dir = parent_dir.parent
+
+    def _detect_venv_uncached(self, script_dir: Path) -> Optional[Dict[str, str]]:
+
         # Check for common virtual environment patterns
         venv_info = {}
-        
+
         # 1. Check for venv/env directories in the script directory
-        for venv_name in ['venv', 'env', '.venv', '.env']:
-            venv_path = script_dir / venv_name
-            if venv_path.exists() and venv_path.is_dir():
-                # Check if it's a valid venv by looking for activate script
-                activate_scripts = [
-                    venv_path / 'Scripts' / 'activate',      # Windows
-                    venv_path / 'Scripts' / 'activate.bat',  # Windows
-                    venv_path / 'bin' / 'activate',          # Linux/macOS
-                ]
-                
-                for activate_script in activate_scripts:
-                    if activate_script.exists():
-                        venv_info['path'] = str(venv_path)
-                        venv_info['type'] = 'venv'
-                        venv_info['activate_script'] = str(activate_script)
-                        # Don't return yet, continue to check for requirements files
-                        break
-        
+        hit = self._probe_dir_for_venv(script_dir)
+        if hit:
+            # Don't return yet, continue to check for requirements files
+            venv_info.update(hit)
+
+        # One directory listing answers every project-file probe below —
+        # a single getdents instead of eight stat calls
+        try:
+            entries = {entry.name for entry in os.scandir(script_dir)}
+        except OSError:
+            entries = set()
+
         # 2. Check for conda environment first (highest priority - most specific)
-        conda_env_files = [
-            script_dir / 'environment.yml',
-            script_dir / 'environment.yaml',
-            script_dir / 'conda.yml',
-            script_dir / 'conda.yaml'
-        ]
-        
-        for conda_env_file in conda_env_files:
-            if conda_env_file.exists():
-                venv_info['conda_env_file'] = str(conda_env_file)
-                # Parse the environment name from the file
-                conda_env_name = self.parse_conda_env_name(str(conda_env_file))
-                if conda_env_name:
-                    venv_info['conda_env_name'] = conda_env_name
-                venv_info['type'] = 'conda'  # Conda environments take priority
-                break
-        
+        conda_hit = next((name for name in self.CONDA_NAMES if name in entries), None)
+        if conda_hit:
+            conda_env_file = script_dir / conda_hit
+            venv_info['conda_env_file'] = str(conda_env_file)
+            # Parse the environment name from the file
+            conda_env_name = self.parse_conda_env_name(str(conda_env_file))
+            if conda_env_name:
+                venv_info['conda_env_name'] = conda_env_name
+            venv_info['type'] = 'conda'  # Conda environments take priority
+
         # 3. Check for requirements.txt or pyproject.toml (suggests project with dependencies)
-        requirements_files = [
-            script_dir / 'requirements.txt',
-            script_dir / 'pyproject.toml',
-            script_dir / 'setup.py',
-            script_dir / 'poetry.lock'
-        ]
-        
-        for req_file in requirements_files:
-            if req_file.exists():
-                venv_info['requirements_file'] = str(req_file)
-                if not venv_info.get('type'):  # Only set type if not already set (conda takes priority)
-                    venv_info['type'] = 'project'
-                break
-        
+        req_hit = next((name for name in self.REQ_NAMES if name in entries), None)
+        if req_hit:
+            venv_info['requirements_file'] = str(script_dir / req_hit)
+            if not venv_info.get('type'):  # Only set type if not already set (conda takes priority)
+                venv_info['type'] = 'project'
+
         # 4. Check parent directories for venv (up to 3 levels) - only if no venv found yet
         if venv_info.get('type') != 'venv':
-            parent_dir = script_dir.parent
-            for level in range(3):
-                if parent_dir == parent_dir.parent:  # Reached root
-                    break
-                
-                for venv_name in ['venv', 'env', '.venv', '.env']:
-                    venv_path = parent_dir / venv_name
-                    if venv_path.exists() and venv_path.is_dir():
-                        activate_scripts = [
-                            venv_path / 'Scripts' / 'activate',      # Windows
-                            venv_path / 'Scripts' / 'activate.bat',  # Windows
-                            venv_path / 'bin' / 'activate',          # Linux/macOS
-                        ]
-                        
-                        for activate_script in activate_scripts:
-                            if activate_script.exists():
-                                venv_info['path'] = str(venv_path)
-                                venv_info['type'] = 'venv'
-                                venv_info['activate_script'] = str(activate_script)
-                                venv_info['parent_level'] = level + 1
-                                # Also check for requirements in parent dir
-                                for req_file in requirements_files:
-                                    if req_file.exists():
-                                        venv_info['requirements_file'] = str(req_file)
-                                        break
-                                return venv_info
-                
-                parent_dir = parent_dir.parent
+            for level, parent_dir in self._walk_parent_dirs(script_dir):
+                hit = self._probe_dir_for_venv(parent_dir)
+                if hit:
+                    venv_info.update(hit)
+                    venv_info['parent_level'] = level
+                    # The requirements probe above already covered the
+                    # script directory; nothing new to stat here
+                    if req_hit:
+                        venv_info['requirements_file'] = str(script_dir / req_hit)
+                    return venv_info
         
         return venv_info if venv_info else None
     
@@ -115,39 +169,82 @@ class VenvDetector:
     
     def get_venv_python_from_path(self, venv_path: Path) -> Optional[str]:
         """Get Python executable from a virtual environment path."""
-        python_executables = [
-            venv_path / 'Scripts' / 'python.exe',    # Windows
-            venv_path / 'Scripts' / 'python',        # Windows
-            venv_path / 'bin' / 'python',            # Linux/macOS
-            venv_path / 'bin' / 'python3',           # Linux/macOS
-        ]
-        
-        for python_exe in python_executables:
-            if python_exe.exists():
-                return str(python_exe)
-        
+        probe = self._probe_venv(venv_path)
+        if probe and probe[1]:
+            return probe[1]
         return None
     
     def parse_conda_env_name(self, conda_env_file: str) -> Optional[str]:
         """Parse the environment name from a conda environment.yml file."""
+        # Stat compare keeps the cache honest while skipping re-reads of
+        # the same unchanged file across alias creations
         try:
+            st = os.stat(conda_env_file)
+            cache_key = (conda_env_file, st.st_mtime_ns, st.st_size)
+        except OSError:
+            cache_key = None
+        if cache_key is not None and cache_key in self._env_name_cache:
+            return self._env_name_cache[cache_key]
+
+        name = self._parse_conda_env_name_uncached(conda_env_file)
+        if cache_key is not None:
+            self._env_name_cache[cache_key] = name
+        return name
+
+    def _parse_conda_env_name_uncached(self, conda_env_file: str) -> Optional[str]:
+        try:
+            # Stream and stop at the first name: line — usually the very
+            # first one in the file — instead of reading everything
             with open(conda_env_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Look for name: field in the YAML file
-            for line in content.split('\n'):
-                line = line.strip()
-                if line.startswith('name:'):
-                    # Extract name after 'name:'
-                    name_match = re.search(r'name:\s*([^\s#]+)', line)
+                for line in f:
+                    name_match = _CONDA_NAME_RE.match(line.strip())
                     if name_match:
                         return name_match.group(1).strip('"\'')
-            
+
             return None
         except Exception as e:
             print(f"Error parsing conda environment file: {e}")
             return None
     
+    @staticmethod
+    def _read_conda_envs_file() -> Set[str]:
+        """Read env prefixes from ~/.conda/environments.txt.
+
+        Conda maintains this file itself (one prefix per line); reading it
+        costs a fraction of a millisecond where `conda info --envs` spawns
+        a full interpreter.  Returns an empty set when the file is missing.
+        """
+        prefixes = set()
+        try:
+            with open(Path.home() / '.conda' / 'environments.txt', 'r',
+                      encoding='utf-8') as f:
+                for line in f:
+                    prefix = line.strip()
+                    if prefix:
+                        prefixes.add(prefix)
+        except OSError:
+            pass
+        return prefixes
+
+    def _load_conda_envs(self) -> Dict[str, str]:
+        """Load and cache the env name -> prefix map from `conda info --envs`."""
+        if self._conda_envs_map is None:
+            envs = {}
+            try:
+                result = subprocess.run(['conda', 'info', '--envs'],
+                                      capture_output=True, text=True, timeout=30)
+                if result.returncode == 0:
+                    for line in result.stdout.splitlines():
+                        if line.startswith('#'):
+                            continue
+                        parts = line.split()
+                        if len(parts) >= 2:
+                            envs[parts[0]] = parts[-1]
+            except Exception as e:
+                print(f"Error listing conda environments: {e}")
+            self._conda_envs_map = envs
+        return self._conda_envs_map
+
     def get_conda_python_executable(self, venv_info: Dict[str, str]) -> Optional[str]:
         """Get the Python executable path for a conda environment."""
         if not venv_info or venv_info.get('type') != 'conda':
@@ -156,31 +253,28 @@ class VenvDetector:
         conda_env_name = venv_info.get('conda_env_name')
         if not conda_env_name:
             return None
-        
+
         try:
-            # Try to get conda environment info
-            result = subprocess.run(['conda', 'info', '--envs'], 
-                                  capture_output=True, text=True, timeout=30)
-            if result.returncode == 0 and conda_env_name in result.stdout:
-                # Environment exists, construct Python executable path
-                env_path = None
-                for line in result.stdout.split('\n'):
-                    if conda_env_name in line and not line.startswith('#'):
-                        parts = line.strip().split()
-                        if len(parts) >= 2:
-                            env_path = Path(parts[-1])
-                            break
-                
-                if env_path:
-                    # Construct Python executable path
-                    if os.name == 'nt':
-                        python_exe = env_path / 'python.exe'
-                    else:
-                        python_exe = env_path / 'bin' / 'python'
-                    
-                    if python_exe.exists():
-                        return str(python_exe)
-            
+            # First consult conda's own on-disk env registry — no
+            # subprocess at all in the normal case
+            env_path = next((p for p in self._read_conda_envs_file()
+                             if os.path.basename(p) == conda_env_name), None)
+
+            # Then the cached name -> prefix map; `conda info --envs` is
+            # spawned at most once per process
+            if not env_path:
+                env_path = self._load_conda_envs().get(conda_env_name)
+            if env_path:
+                # Construct Python executable path
+                env_path = Path(env_path)
+                if os.name == 'nt':
+                    python_exe = env_path / 'python.exe'
+                else:
+                    python_exe = env_path / 'bin' / 'python'
+
+                if python_exe.exists():
+                    return str(python_exe)
+
             # Fallback: try conda run to get python executable
             result = subprocess.run(['conda', 'run', '-n', conda_env_name, 'python', '-c', 
                                    'import sys; print(sys.executable)'], 
@@ -195,11 +289,56 @@ class VenvDetector:
         
         return None
     
+    def list_conda_envs(self) -> Optional[Set[str]]:
+        """List conda environment names without spawning conda.
+
+        Conda records its environments in ~/.conda/environments.txt (one
+        prefix per line) and under the install's envs/ directory; reading
+        those directly avoids the ~500 ms `conda env list` subprocess.
+        Returns None when neither source exists so callers can fall back
+        to the subprocess.
+        """
+        names = set()
+        found_source = False
+
+        env_txt = Path.home() / '.conda' / 'environments.txt'
+        try:
+            with open(env_txt, 'r', encoding='utf-8') as f:
+                for line in f:
+                    prefix = line.strip()
+                    if prefix:
+                        names.add(os.path.basename(prefix))
+            found_source = True
+        except OSError:
+            pass
+
+        # envs/ directories of the conda install(s) we can locate
+        conda_roots = [os.environ.get('CONDA_ROOT'), os.environ.get('CONDA_PREFIX')]
+        for root in conda_roots:
+            if not root:
+                continue
+            try:
+                names.update(os.listdir(os.path.join(root, 'envs')))
+                found_source = True
+            except OSError:
+                pass
+
+        return names if found_source else None
+
     def check_conda_available(self) -> bool:
         """Check if conda is available in the system."""
-        try:
-            result = subprocess.run(['conda', '--version'], 
-                                  capture_output=True, text=True, timeout=10)
-            return result.returncode == 0
-        except Exception:
-            return False
+        # A cached PATH lookup answers in ~1 ms where spawning
+        # `conda --version` takes a couple hundred
+        if not hasattr(self, '_conda_path'):
+            self._conda_path = shutil.which('conda')
+        return self._conda_path is not None
+
+
+# Shared detector instance: every consumer sees the same caches, so a
+# directory statted for one alias is never re-statted for the next
+_DETECTOR_SINGLETON = VenvDetector()
+
+
+def get_detector() -> VenvDetector:
+    """Return the process-wide VenvDetector instance."""
+    return _DETECTOR_SINGLETON
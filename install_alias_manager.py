@@ -10,6 +10,18 @@ import shutil
 import subprocess
 from pathlib import Path
 
+def _copy_if_changed(src, dst):
+    """copy2 that skips files whose size and mtime already match."""
+    try:
+        src_st = os.stat(src)
+        dst_st = os.stat(dst)
+        if (src_st.st_mtime_ns == dst_st.st_mtime_ns
+                and src_st.st_size == dst_st.st_size):
+            return dst
+    except OSError:
+        pass
+    return shutil.copy2(src, dst)
+
 def main():
     print("Python Alias Manager Installer")
     print("=" * 40)
@@ -36,12 +48,23 @@ def main():
     shutil.copy2(alias_manager_script, dest_script)
     print(f"✓ Installed main script to: {dest_script}")
     
-    # Copy the entire alias_manager package
+    # Copy the entire alias_manager package in place.  Re-installs only
+    # touch files that actually changed instead of deleting and recopying
+    # the whole tree.
     dest_package = install_dir / "alias_manager"
-    if dest_package.exists():
-        shutil.rmtree(dest_package)
-    shutil.copytree(alias_manager_package, dest_package, ignore=shutil.ignore_patterns('__pycache__', '*.pyc'))
+    shutil.copytree(alias_manager_package, dest_package, dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns('__pycache__', '*.pyc'),
+                    copy_function=_copy_if_changed)
     print(f"✓ Installed alias_manager package to: {dest_package}")
+
+    # Pre-compile bytecode so the first 'pam' run doesn't pay .py -> .pyc
+    # compilation for every module (pip does this for wheel installs, but
+    # nothing compiles this copied tree otherwise)
+    import compileall
+    if compileall.compile_dir(str(dest_package), quiet=1, workers=0):
+        print(f"✓ Pre-compiled package bytecode")
+    else:
+        print("⚠️  Bytecode pre-compilation failed (will compile on first run)")
     
     # Create a convenient batch file for the manager itself (Windows)
     manager_batch = install_dir / "pam.bat"
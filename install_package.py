@@ -4,42 +4,89 @@ Package Installer for Python Alias Manager
 Installs the package using pip and sets up the command-line interface.
 """
 
+import importlib.util
 import os
 import sys
 import subprocess
-import tempfile
-import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Resolved once at import: .resolve() canonicalizes symlinks so later
+# path comparisons need no repeated normalization
+PACKAGE_DIR = Path(__file__).resolve().parent
 
-def run_command(cmd, check=True, capture_output=True):
-    """Run a shell command and return the result."""
+# Computed once; Path.home() re-reads the home env vars on every call
+SCRIPTS_DIR = Path.home() / ".python_aliases" / "scripts"
+
+
+def run_command(cmd, check=True, capture_output=True, quiet=False):
+    """Run a command (argument list or shell string) and return the result.
+
+    quiet discards both output streams at the OS level — no pipes are
+    created, drained or decoded — for calls where only the exit status
+    matters.
+    """
     try:
-        result = subprocess.run(
-            cmd, 
-            shell=True, 
-            check=check, 
-            capture_output=capture_output, 
-            text=True
-        )
+        # List form skips the shell hop entirely; only plain strings still
+        # go through the shell
+        if quiet:
+            result = subprocess.run(
+                cmd,
+                shell=isinstance(cmd, str),
+                check=check,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        else:
+            result = subprocess.run(
+                cmd,
+                shell=isinstance(cmd, str),
+                check=check,
+                capture_output=capture_output,
+                text=True
+            )
         return result
     except subprocess.CalledProcessError as e:
-        print(f"Command failed: {cmd}")
-        print(f"Error: {e}")
-        if e.stdout:
-            print(f"Stdout: {e.stdout}")
-        if e.stderr:
-            print(f"Stderr: {e.stderr}")
+        if not quiet:
+            print(f"Command failed: {cmd}")
+            print(f"Error: {e}")
+            if e.stdout:
+                print(f"Stdout: {e.stdout}")
+            if e.stderr:
+                print(f"Stderr: {e.stderr}")
         raise
 
 
+def _write_if_changed(path, content, mode=None):
+    """Write content only when the file does not already hold it.
+
+    Repeat installs leave both launcher scripts byte-identical, so the
+    common reinstall path skips the disk writes entirely.
+    """
+    data = content.encode()
+    try:
+        if path.read_bytes() == data:
+            return
+    except OSError:
+        pass
+    if mode is not None:
+        # Setting the mode at creation saves the separate chmod syscall;
+        # the umask may clear group/other write bits, which 0o755 lacks
+        # anyway
+        fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+    else:
+        path.write_bytes(data)
+
+
 def check_pip():
     """Check if pip is available."""
-    try:
-        run_command("pip --version")
-        return True
-    except subprocess.CalledProcessError:
-        return False
+    # An in-process module lookup answers instantly; spawning
+    # `pip --version` pays a full interpreter startup just to probe
+    return importlib.util.find_spec("pip") is not None
 
 
 def install_package():
@@ -52,24 +99,38 @@ def install_package():
         print("Error: pip is not available. Please install pip first.")
         return False
     
-    # Get the directory where this installer is located
-    package_dir = Path(__file__).parent.absolute()
-    
-    # Check if required files exist
-    pyproject_file = package_dir / "pyproject.toml"
-    if not pyproject_file.exists():
+    # Directory where this installer is located
+    package_dir = PACKAGE_DIR
+
+    # Check required files against one directory listing instead of a
+    # stat per candidate
+    try:
+        names = {entry.name for entry in os.scandir(package_dir)}
+    except OSError:
+        names = set()
+    if "pyproject.toml" not in names:
         print(f"Error: pyproject.toml not found in {package_dir}")
         return False
     
-    # Install the package in development mode
+    # Install the package in development mode.  Calling pip in-process
+    # avoids a subprocess altogether; when pip's internal entry point is
+    # unavailable, fall back to `sys.executable -m pip` (no shell, no pip
+    # launcher, same interpreter guaranteed).
     print(f"Installing package from: {package_dir}")
     try:
-        cmd = f'pip install -e "{package_dir}"'
-        result = run_command(cmd, capture_output=False)
+        from pip._internal.cli.main import main as pip_main
+        if pip_main(["install", "-e", str(package_dir)]) != 0:
+            print("✗ Failed to install package with pip.")
+            return False
         print("✓ Package installed successfully!")
-    except subprocess.CalledProcessError:
-        print("✗ Failed to install package with pip.")
-        return False
+    except ImportError:
+        try:
+            run_command([sys.executable, "-m", "pip", "install", "-e", str(package_dir)],
+                        capture_output=False)
+            print("✓ Package installed successfully!")
+        except subprocess.CalledProcessError:
+            print("✗ Failed to install package with pip.")
+            return False
     
     return True
 
@@ -77,19 +138,12 @@ def install_package():
 def create_command_scripts():
     """Create command-line scripts for easy access."""
     print("\nCreating command-line scripts...")
-    
-    # Find the installed package location
-    try:
-        result = run_command("python -c \"import alias_manager; print(alias_manager.__file__)\"")
-        package_path = Path(result.stdout.strip()).parent
-        print(f"Package installed at: {package_path}")
-    except subprocess.CalledProcessError:
-        print("Warning: Could not determine package installation location.")
-        return False
-    
-    # Create scripts directory
-    scripts_dir = Path.home() / ".python_aliases" / "scripts"
-    scripts_dir.mkdir(parents=True, exist_ok=True)
+
+    # Create scripts directory; the is_dir guard keeps repeat installs to
+    # one stat instead of an mkdir that fails with EEXIST
+    scripts_dir = SCRIPTS_DIR
+    if not scripts_dir.is_dir():
+        scripts_dir.mkdir(parents=True, exist_ok=True)
     
     # Create Windows batch file
     batch_file = scripts_dir / "pam.bat"
@@ -97,60 +151,127 @@ def create_command_scripts():
 python -m alias_manager.cli %*
 '''
     
-    with open(batch_file, 'w') as f:
-        f.write(batch_content)
+    _write_if_changed(batch_file, batch_content)
     print(f"✓ Created Windows batch file: {batch_file}")
-    
+
     # Create Unix shell script
     shell_file = scripts_dir / "pam"
     shell_content = '''#!/bin/bash
 python -m alias_manager.cli "$@"
 '''
-    
-    with open(shell_file, 'w') as f:
-        f.write(shell_content)
-    shell_file.chmod(0o755)
+
+    _write_if_changed(shell_file, shell_content, mode=0o755)
     print(f"✓ Created shell script: {shell_file}")
     
     return scripts_dir
 
 
-def setup_path(scripts_dir):
+def probe_installation():
+    """Locate the installed package and smoke-test the CLI in one subprocess.
+
+    Returns (package_path, ok); package_path is None when the probe failed.
+    Fusing the two checks halves the interpreter-startup cost, which
+    dominates both.
+    """
+    probe = ("import sys, alias_manager; print(alias_manager.__file__); "
+             "sys.argv = ['pam', '--help']; "
+             "import alias_manager.cli as c; c.main()")
+    try:
+        result = run_command([sys.executable, "-c", probe])
+        package_path = Path(result.stdout.splitlines()[0].strip()).parent
+        return package_path, True
+    except (subprocess.CalledProcessError, IndexError):
+        return None, False
+
+
+def _add_to_windows_path(scripts_dir_str):
+    """Append scripts_dir_str to the user PATH, preferring a direct
+    registry write over spawning PowerShell for one SetEnvironmentVariable
+    call.  Returns True on success."""
+    try:
+        import winreg
+    except ImportError:
+        # Non-Windows Python: keep the PowerShell route (e.g. WSL with
+        # Windows interop)
+        try:
+            run_command([
+                'powershell', '-Command',
+                f'[Environment]::SetEnvironmentVariable("Path", $env:Path + ";{scripts_dir_str}", [EnvironmentVariableTarget]::User)'
+            ], quiet=True)
+            return True
+        except (subprocess.CalledProcessError, OSError):
+            return False
+
+    try:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, 'Environment', 0,
+                            winreg.KEY_READ | winreg.KEY_WRITE) as key:
+            try:
+                current, value_type = winreg.QueryValueEx(key, 'Path')
+            except FileNotFoundError:
+                current, value_type = '', winreg.REG_EXPAND_SZ
+            new_value = f'{current};{scripts_dir_str}' if current else scripts_dir_str
+            winreg.SetValueEx(key, 'Path', 0, value_type, new_value)
+
+        # Tell open shells the environment changed, as PowerShell's
+        # SetEnvironmentVariable would have
+        import ctypes
+        HWND_BROADCAST, WM_SETTINGCHANGE = 0xFFFF, 0x1A
+        ctypes.windll.user32.SendMessageTimeoutW(
+            HWND_BROADCAST, WM_SETTINGCHANGE, 0, 'Environment', 0, 1000, None)
+        return True
+    except OSError as e:
+        print(f"Registry update failed: {e}")
+        return False
+
+
+def setup_path(scripts_dir, assume_yes=False):
     """Set up PATH environment variable."""
-    path_env = os.environ.get('PATH', '')
     scripts_dir_str = str(scripts_dir)
-    
-    if scripts_dir_str not in path_env:
-        print(f"\n⚠️  PATH Setup Required:")
-        print(f"To use 'pam' command from anywhere, add this directory to your PATH:")
-        print(f"  {scripts_dir_str}")
-        print()
-        print("Windows Setup Instructions:")
-        print("1. Press Win + R, type 'sysdm.cpl' and press Enter")
-        print("2. Click 'Environment Variables'")
-        print("3. Under 'User variables', find 'Path' and click 'Edit'")
-        print("4. Click 'New' and add the path above")
-        print("5. Click 'OK' to save and restart your terminal")
-        print()
-        print("PowerShell Command (as Administrator):")
-        print(f'[Environment]::SetEnvironmentVariable("Path", $env:Path + ";{scripts_dir_str}", [EnvironmentVariableTarget]::User)')
-        print()
-        print("Bash/Linux/macOS Setup Instructions:")
-        print("Add this line to your ~/.bashrc, ~/.zshrc, or ~/.profile:")
-        print(f'export PATH="$PATH:{scripts_dir_str}"')
-        print("Then run: source ~/.bashrc (or restart your terminal)")
-        
-        response = input("\nWould you like to try adding to PATH automatically? (y/n): ")
+    # Exact membership over the split entries, normalized for case on
+    # Windows — a substring scan of the raw PATH string can false-positive
+    # when another entry merely contains this directory as a prefix
+    path_entries = {os.path.normcase(p)
+                    for p in os.environ.get('PATH', '').split(os.pathsep) if p}
+
+    if os.path.normcase(scripts_dir_str) not in path_entries:
+        # One write for the whole banner: a single stdio lock/flush round
+        # trip instead of ~18, which matters on slow Windows consoles
+        sys.stdout.write(f'''
+⚠️  PATH Setup Required:
+To use 'pam' command from anywhere, add this directory to your PATH:
+  {scripts_dir_str}
+
+Windows Setup Instructions:
+1. Press Win + R, type 'sysdm.cpl' and press Enter
+2. Click 'Environment Variables'
+3. Under 'User variables', find 'Path' and click 'Edit'
+4. Click 'New' and add the path above
+5. Click 'OK' to save and restart your terminal
+
+PowerShell Command (as Administrator):
+[Environment]::SetEnvironmentVariable("Path", $env:Path + ";{scripts_dir_str}", [EnvironmentVariableTarget]::User)
+
+Bash/Linux/macOS Setup Instructions:
+Add this line to your ~/.bashrc, ~/.zshrc, or ~/.profile:
+export PATH="$PATH:{scripts_dir_str}"
+Then run: source ~/.bashrc (or restart your terminal)
+''')
+        sys.stdout.flush()
+
+
+        # Never block on input() when nobody is attached (CI, Docker):
+        # auto-answer from --yes / PAM_AUTO_PATH instead of hanging
+        if assume_yes:
+            response = 'y'
+        elif sys.stdin.isatty():
+            response = input("\nWould you like to try adding to PATH automatically? (y/n): ")
+        else:
+            response = 'y' if os.environ.get('PAM_AUTO_PATH') else 'n'
         if response.lower() == 'y':
-            try:
-                cmd = [
-                    'powershell', '-Command',
-                    f'[Environment]::SetEnvironmentVariable("Path", $env:Path + ";{scripts_dir_str}", [EnvironmentVariableTarget]::User)'
-                ]
-                subprocess.run(cmd, check=True)
+            if _add_to_windows_path(scripts_dir_str):
                 print("✓ Added to PATH successfully!")
                 print("Please restart your terminal for changes to take effect.")
-            except subprocess.CalledProcessError:
+            else:
                 print("✗ Failed to add to PATH automatically. Please add manually.")
     else:
         print(f"✓ Directory already in PATH: {scripts_dir_str}")
@@ -158,19 +279,37 @@ def setup_path(scripts_dir):
 
 def main():
     """Main installer function."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Install Python Alias Manager")
+    parser.add_argument('-y', '--yes', action='store_true',
+                        help="answer yes to prompts (e.g. PATH setup)")
+    args = parser.parse_args()
+
     try:
         # Install the package
         if not install_package():
             return
         
-        # Create command scripts
-        scripts_dir = create_command_scripts()
+        # Script creation and the locate+smoke-test probe are independent
+        # steps; overlapping them roughly halves the post-install wall
+        # clock.  The probe defers its printing until after the join, so
+        # the two never interleave output.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            scripts_future = pool.submit(create_command_scripts)
+            probe_future = pool.submit(probe_installation)
+            scripts_dir = scripts_future.result()
+            package_path, test_ok = probe_future.result()
         if not scripts_dir:
             return
-        
-        # Set up PATH
-        setup_path(scripts_dir)
-        
+
+        if package_path:
+            print(f"Package installed at: {package_path}")
+        else:
+            print("Warning: Could not determine package installation location.")
+
+        # Set up PATH (potentially interactive, so it stays serial)
+        setup_path(scripts_dir, assume_yes=args.yes)
+
         print("\nInstallation complete!")
         print("\nThe 'pam' command is now available.")
         print("You can also use: python -m alias_manager.cli")
@@ -180,14 +319,13 @@ def main():
         print("  pam remove myapp")
         print("  pam setup  # Check PATH configuration")
         
-        # Test the installation
+        # Report the smoke test that ran concurrently above
         print("\nTesting installation...")
-        try:
-            result = run_command("python -m alias_manager.cli --help", capture_output=False)
+        if test_ok:
             print("✓ Installation test successful!")
-        except subprocess.CalledProcessError:
+        else:
             print("⚠️  Installation test failed. The package may not be properly installed.")
-        
+
     except Exception as e:
         print(f"Installation failed: {e}")
         return
@@ -4,15 +4,43 @@ Simple installer for Python Alias Manager
 Uses pip to install the package with proper entry points.
 """
 
+import json
+import os
+import shutil
 import subprocess
 import sys
 from pathlib import Path
 
+# Resolved once at import: .resolve() canonicalizes symlinks so the
+# already-installed URI comparison needs no repeated normalization
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+
+def already_installed(package_dir):
+    """Return True when an editable install already points at package_dir.
+
+    pip records the source location of editable installs in
+    direct_url.json; when it matches, re-running `pip install -e` would
+    only re-resolve and re-link to the same result, so the multi-second
+    pip invocation can be skipped entirely.
+    """
+    try:
+        from importlib.metadata import distribution
+        dist = distribution("pythonaliasmanager")
+        durl = json.loads(dist.read_text("direct_url.json") or "{}")
+        return (durl.get("url") == Path(package_dir).as_uri()
+                and durl.get("dir_info", {}).get("editable", False))
+    except Exception:
+        return False
+
 
 def run_command(cmd):
-    """Run a command and return success status."""
+    """Run a command (argument list or shell string) and return success status."""
     try:
-        result = subprocess.run(cmd, shell=True, check=True, capture_output=True, text=True)
+        # List form skips the shell hop; only plain strings still go
+        # through the shell
+        result = subprocess.run(cmd, shell=isinstance(cmd, str), check=True,
+                                capture_output=True, text=True)
         return True, result.stdout
     except subprocess.CalledProcessError as e:
         return False, e.stderr
@@ -23,38 +51,65 @@ def main():
     print("Python Alias Manager - Simple Installer")
     print("=" * 40)
     
-    # Get current directory
-    current_dir = Path(__file__).parent.absolute()
+    # Directory where this installer is located
+    current_dir = PACKAGE_DIR
     
-    # Check if we have the required files
-    if not (current_dir / "pyproject.toml").exists():
+    # Check required files against one directory listing instead of a
+    # stat per candidate
+    try:
+        names = {entry.name for entry in os.scandir(current_dir)}
+    except OSError:
+        names = set()
+
+    if "pyproject.toml" not in names:
         print("❌ Error: pyproject.toml not found!")
         print("Make sure you're running this from the project root directory.")
         return False
-    
-    if not (current_dir / "alias_manager").exists():
+
+    if "alias_manager" not in names:
         print("❌ Error: alias_manager package not found!")
         return False
     
     print("📦 Installing Python Alias Manager...")
-    
-    # Install in editable mode for development
-    install_cmd = f'pip install -e "{current_dir}"'
-    success, output = run_command(install_cmd)
-    
-    if not success:
-        print("❌ Installation failed!")
-        print("Error output:", output)
-        return False
-    
-    print("✅ Installation successful!")
+
+    if already_installed(current_dir):
+        print("✅ Already installed in editable mode from this directory — skipping pip")
+    else:
+        # Install in editable mode for development — `sys.executable -m pip`
+        # skips the shell and the pip launcher, and guarantees the running
+        # interpreter's pip is the one used
+        success, output = run_command([sys.executable, "-m", "pip", "install", "-e", str(current_dir)])
+
+        if not success:
+            print("❌ Installation failed!")
+            print("Error output:", output)
+            return False
+
+        print("✅ Installation successful!")
     print()
     
-    # Test the installation
+    # Test the installation in-process: a clean import plus --help covers
+    # the real post-install failure mode (broken install) without the
+    # shell -> PATH -> launcher -> interpreter chain of spawning `pam`
     print("🧪 Testing installation...")
-    test_success, test_output = run_command("pam --help")
+    try:
+        import contextlib
+        import io
+        from alias_manager.cli import main as cli_main
+        saved_argv = sys.argv
+        sys.argv = ['pam', '--help']
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                cli_main()
+        finally:
+            sys.argv = saved_argv
+        test_success = True
+    except Exception:
+        test_success = False
     
-    if test_success:
+    # PATH availability is a separate question from whether the package
+    # works; shutil.which answers it with a few stats instead of a spawn
+    if test_success and shutil.which("pam"):
         print("✅ Command 'pam' is working correctly!")
         print()
         print("🎉 Installation Complete!")
@@ -6,7 +6,18 @@ Creates and manages aliases for Python scripts that can be run from anywhere in
 This is the main entry point that imports from the modular package structure.
 """
 
-from alias_manager.cli import main
+import sys
 
 if __name__ == "__main__":
+    # Answer --version from the package metadata alone; the package
+    # __init__ is lazy, so this skips loading the CLI and everything it
+    # pulls in
+    if sys.argv[1:2] in (['--version'], ['-V']):
+        from alias_manager import __version__
+        print(f"pam {__version__}")
+        sys.exit(0)
+
+    # Imported here so merely loading this file (e.g. by tooling) stays
+    # free of the CLI import cost
+    from alias_manager.cli import main
     main()